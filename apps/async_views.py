@@ -0,0 +1,213 @@
+"""
+Async versions of the latency-critical endpoints, served under /api/v1/async/ by the ASGI
+deployment (config.asgi). They return the same payloads as their DRF counterparts in
+apps/views.py, but a request waiting on Postgres or Qdrant does not hold a worker thread.
+"""
+import asyncio
+import json
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from apps.cards.models import Card, ReviewLog, card_only_fields
+from apps.conditional import add_validators, aqueryset_etag, etag_matches
+from apps.ingest.models import Source
+from apps.serializers import CardSerializer, ReviewCardSerializer, source_fields
+from services.events import get_event_hub
+from services.llm import EmbeddingError, LLMService
+from services.scheduler import calculate_next_review
+from services.vector import get_async_vector_service
+
+_jwt = JWTAuthentication()
+
+
+async def authenticate(request):
+    """
+    JWT authentication without blocking: the token is checked in-process and the user
+    is loaded with the async ORM. Returns None when the request is not authenticated.
+    """
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = _jwt.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (InvalidToken, TokenError, KeyError):
+        return None
+
+    User = get_user_model()
+    try:
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        return None
+    return user if user.is_active else None
+
+
+def jwt_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await authenticate(request)
+        if user is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@require_GET
+@jwt_required
+async def review_session(request):
+    """
+    Async GET /review/session/.
+    Query params: deck (optional, defaults to all of the user's decks), limit (optional, max 500)
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 500)
+    except ValueError:
+        return JsonResponse({"error": "limit must be an integer"}, status=400)
+
+    qs = Card.objects.filter(next_review_at__lte=timezone.now(), deck__owner=request.user)
+    deck_id = request.GET.get('deck')
+    if deck_id:
+        qs = qs.filter(deck_id=deck_id)
+
+    etag = await aqueryset_etag(request, qs)
+    if etag_matches(request, etag):
+        return add_validators(HttpResponseNotModified(), etag)
+
+    cards = [
+        card async for card in qs.select_related('content')
+        .order_by('next_review_at')
+        .only(*card_only_fields(source_fields(ReviewCardSerializer())))[:limit]
+    ]
+    response = JsonResponse({
+        "count": len(cards),
+        "cards": ReviewCardSerializer(cards, many=True, context={'request': request}).data
+    })
+    return add_validators(response, etag)
+
+
+@csrf_exempt
+@require_POST
+@jwt_required
+async def review_rate(request, card_id):
+    """
+    Async POST /review/{id}/rate/ with {"rating": 0-5}. Only the user's own cards can be rated.
+    """
+    try:
+        rating = int(json.loads(request.body or b'{}').get('rating', 0))
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({"error": "Rating must be 0-5"}, status=400)
+    if rating < 0 or rating > 5:
+        return JsonResponse({"error": "Rating must be 0-5"}, status=400)
+
+    try:
+        card = await Card.objects.only('id', *Card.SCHEDULE_FIELDS).aget(pk=card_id, deck__owner=request.user)
+    except Card.DoesNotExist:
+        return JsonResponse({"error": "Card not found"}, status=404)
+
+    await ReviewLog.objects.acreate(card=card, rating=rating)
+
+    card.sm2_ease, card.sm2_interval, card.sm2_repetitions, card.next_review_at = calculate_next_review(
+        rating,
+        card.sm2_ease,
+        card.sm2_interval,
+        card.sm2_repetitions
+    )
+    await card.asave(update_fields=[*Card.SCHEDULE_FIELDS, 'updated_at'])
+
+    return JsonResponse({
+        "next_review_at": card.next_review_at,
+        "interval_days": card.sm2_interval
+    })
+
+
+@require_GET
+@jwt_required
+async def card_search(request):
+    """
+    Async GET /cards/search/.
+    Query params: q (required), deck (optional), limit (optional, max 50)
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({"error": "Query parameter 'q' is required"}, status=400)
+
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 50)
+        deck_id = request.GET.get('deck')
+        deck_id = int(deck_id) if deck_id else None
+    except ValueError:
+        return JsonResponse({"error": "deck and limit must be integers"}, status=400)
+
+    # The Gemini SDK is synchronous; run it off the event loop (cache hits return quickly)
+    get_embedding = sync_to_async(LLMService().get_embedding, thread_sensitive=False)
+    try:
+        vector = await get_embedding(query, task_type="retrieval_query")
+    except (EmbeddingError, ValueError) as e:
+        # Searching with a placeholder vector would return arbitrary cards
+        print(f"[Search] Query embedding failed: {e}")
+        return JsonResponse({"error": "Search is temporarily unavailable"}, status=503)
+    hits = await get_async_vector_service().search(vector, limit=limit, deck_id=deck_id, owner_id=request.user.id)
+
+    cards = await Card.objects.select_related('content').ain_bulk([card_id for card_id, _ in hits])
+    results = []
+    for card_id, score in hits:
+        card = cards.get(card_id)
+        if card is None:
+            continue
+        data = CardSerializer(card, context={'request': request}).data
+        data['score'] = score
+        results.append(data)
+
+    return JsonResponse({"query": query, "results": results})
+
+
+def sse_message(event) -> str:
+    return f"event: {event['stage']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@require_GET
+@jwt_required
+async def source_events(request, source_id):
+    """
+    Async GET /sources/{id}/events/: Server-Sent Events for a source's ingest pipeline.
+    The first event ("status") is a snapshot; then fetched, generating, cards_created,
+    page_range, generated, embedded and failed events follow as the Celery tasks publish them.
+    """
+    try:
+        source = await Source.objects.only('id', 'status').aget(pk=source_id, deck__owner=request.user)
+    except Source.DoesNotExist:
+        return JsonResponse({"error": "Source not found"}, status=404)
+
+    async def stream():
+        async with get_event_hub().subscribe(source.id) as queue:
+            # Snapshot after subscribing, so no event falls between the two
+            await source.arefresh_from_db(fields=['status'])
+            yield sse_message({
+                "source": source.id,
+                "stage": "status",
+                "status": source.status,
+                "cards": await Card.objects.filter(source_id=source.id).acount(),
+            })
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield sse_message(event)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,73 @@
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.cards.models import Card
+from apps.decks.models import Deck
+from apps.cards.management.commands.bench_search import percentile
+
+
+class Command(BaseCommand):
+    help = "Benchmark review session latency against a synthetic deck. All data is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cards', type=int, default=100000)
+        parser.add_argument('--limit', type=int, default=50, help="Cards per session")
+        parser.add_argument('--runs', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        user = get_user_model().objects.create_user(username=f"bench_{int(time.time())}", password='bench')
+        deck = Deck.objects.create(name="Review Benchmark", owner=user)
+
+        self.stdout.write(f"[Bench] Creating {options['cards']} cards...")
+        now = timezone.now()
+        batch = []
+        for i in range(options['cards']):
+            batch.append(Card(
+                deck=deck,
+                front=f"Question {i}",
+                back=f"Answer {i}",
+                next_review_at=now + timedelta(minutes=random.randint(-30 * 1440, 30 * 1440)),
+            ))
+            if len(batch) == 5000:
+                Card.resolve_contents(batch)
+                Card.objects.bulk_create(batch)
+                batch = []
+        Card.resolve_contents(batch)
+        Card.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Card._meta.db_table}")
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        def timed(url):
+            samples = []
+            for _ in range(options['runs']):
+                start = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.status_code
+            return samples
+
+        session = timed(f"/api/v1/review/session/?deck={deck.id}&limit={options['limit']}")
+        single = timed(f"/api/v1/review/next/?deck={deck.id}")
+
+        self.stdout.write(
+            f"[Bench] session (limit={options['limit']}) p50={percentile(session, 50):.1f}ms "
+            f"p95={percentile(session, 95):.1f}ms"
+        )
+        self.stdout.write(
+            f"[Bench] next (1 card)          p50={percentile(single, 50):.1f}ms "
+            f"p95={percentile(single, 95):.1f}ms "
+            f"(x{options['limit']} round trips ~ {percentile(single, 50) * options['limit']:.0f}ms)"
+        )
@@ -0,0 +1,48 @@
+import random
+import time
+from django.core.management.base import BaseCommand
+from apps.cards.models import Card
+from services.vector import get_vector_service
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Benchmark filtered semantic search (Qdrant query + Postgres hydration) latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--deck', type=int, default=None, help="Filter by deck_id")
+        parser.add_argument('--owner', type=int, default=None, help="Filter by owner_id")
+
+    def handle(self, *args, **options):
+        vector_service = get_vector_service()
+        info = vector_service.client.get_collection(vector_service.collection_name)
+        self.stdout.write(f"[Bench] Collection '{vector_service.collection_name}': {info.points_count} points")
+
+        # Random unit vectors exercise the index without paying for query embeddings
+        search_times, hydrate_times = [], []
+        for _ in range(options['queries']):
+            vector = [random.gauss(0, 1) for _ in range(768)]
+
+            start = time.perf_counter()
+            hits = vector_service.search(
+                vector, limit=options['limit'], deck_id=options['deck'], owner_id=options['owner']
+            )
+            search_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            Card.objects.select_related('content').in_bulk([card_id for card_id, _ in hits])
+            hydrate_times.append((time.perf_counter() - start) * 1000)
+
+        total_times = [s + h for s, h in zip(search_times, hydrate_times)]
+        for label, samples in (("search", search_times), ("hydrate", hydrate_times), ("total", total_times)):
+            self.stdout.write(
+                f"[Bench] {label:<8} p50={percentile(samples, 50):.1f}ms "
+                f"p95={percentile(samples, 95):.1f}ms p99={percentile(samples, 99):.1f}ms"
+            )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from apps.cards.models import CardContent, VisualPayload
+
+
+class Command(BaseCommand):
+    help = "Delete CardContent rows no longer referenced by any card (left behind by edits and deletes), then unreferenced visual payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Report orphans without deleting them")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if options['dry_run']:
+            contents = CardContent.objects.filter(cards__isnull=True).count()
+            visuals = VisualPayload.objects.filter(contents__isnull=True).count()
+            self.stdout.write(f"[Cards] Found {contents} orphaned contents and {visuals} orphaned visuals.")
+            return
+
+        # Contents first: deleting them is what orphans their visuals
+        contents = self.delete_orphans(CardContent, 'cards', batch_size)
+        visuals = self.delete_orphans(VisualPayload, 'contents', batch_size)
+        self.stdout.write(f"[Cards] Deleted {contents} orphaned contents and {visuals} orphaned visuals.")
+
+    def delete_orphans(self, model, related_name, batch_size):
+        unreferenced = {f'{related_name}__isnull': True}
+        deleted = 0
+        while True:
+            ids = list(model.objects.filter(**unreferenced).values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            # Re-check inside the delete: a concurrent edit may have re-interned the row
+            count, _ = model.objects.filter(pk__in=ids, **unreferenced).delete()
+            deleted += count
+            if count == 0:
+                break
+        return deleted
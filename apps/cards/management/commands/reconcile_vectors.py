@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from apps.cards.models import Card
+from services.vector import VectorService
+
+
+class Command(BaseCommand):
+    help = "Purge Qdrant points that no longer belong to a card, and optionally re-embed stale cards."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help="Report orphans without deleting them")
+        parser.add_argument('--reembed', action='store_true', help="Queue embedding for cards missing a keyed vector")
+
+    def handle(self, *args, **options):
+        vector_service = VectorService()
+        batch_size = options['batch_size']
+        scanned = 0
+        orphaned = 0
+
+        for point_ids in vector_service.iter_point_ids(batch_size=batch_size):
+            scanned += len(point_ids)
+            # Points written before IDs were derived from card IDs are UUID strings
+            int_ids = [point_id for point_id in point_ids if isinstance(point_id, int)]
+            live = set(Card.objects.filter(id__in=int_ids).values_list('id', flat=True))
+            orphans = [
+                point_id for point_id in point_ids
+                if not isinstance(point_id, int) or point_id not in live
+            ]
+            orphaned += len(orphans)
+            if orphans and not options['dry_run']:
+                vector_service.delete_points(orphans)
+
+        action = "Found" if options['dry_run'] else "Purged"
+        self.stdout.write(f"[Vector] Scanned {scanned} points. {action} {orphaned} orphans.")
+
+        if options['reembed']:
+            from apps.cards.tasks import embed_cards
+            # Cards without a content hash were embedded under random point IDs
+            stale_ids = list(
+                Card.objects.filter(Q(vector_id__isnull=True) | Q(content_hash=''))
+                .values_list('id', flat=True)
+            )
+            for start in range(0, len(stale_ids), batch_size):
+                embed_cards.delay(stale_ids[start:start + batch_size])
+            self.stdout.write(f"[Vector] Queued {len(stale_ids)} cards for embedding.")
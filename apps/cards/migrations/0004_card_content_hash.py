@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0003_add_hint_difficulty_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='Hash of front/back at last embedding', max_length=64),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0004_card_content_hash'),
+        ('decks', '0003_deck_description'),
+        ('ingest', '0005_source_fetch_validators'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['deck', 'next_review_at'], name='card_deck_due_idx'),
+        ),
+    ]
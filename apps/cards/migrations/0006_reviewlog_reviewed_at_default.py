@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0005_card_deck_due_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reviewlog',
+            name='reviewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0006_reviewlog_reviewed_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('front', models.TextField()),
+                ('back', models.TextField()),
+                ('hint', models.TextField(blank=True, help_text='Optional hint to aid recall', null=True)),
+                ('difficulty', models.CharField(choices=[('basic', 'Basic'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], default='basic', max_length=20)),
+                ('tags', models.JSONField(blank=True, default=list, help_text='Topic tags for organization')),
+                ('visual_payload', models.TextField(blank=True, help_text='SVG code or JSON for generative UI', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='card',
+            name='content',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='cards', to='cards.cardcontent'),
+        ),
+    ]
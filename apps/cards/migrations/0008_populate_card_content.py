@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+import hashlib
+import json
+from django.db import migrations
+
+CONTENT_FIELDS = ('front', 'back', 'hint', 'difficulty', 'tags', 'visual_payload')
+BATCH_SIZE = 2000
+
+
+def content_digest(values):
+    # Must match apps.cards.models.content_digest
+    canonical = json.dumps([values[field] for field in CONTENT_FIELDS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def populate_content(apps, schema_editor):
+    """
+    Moves inline card text into CardContent rows, deduplicated by digest.
+    Cards of existing forks end up sharing content with their parent deck's cards.
+    """
+    Card = apps.get_model('cards', 'Card')
+    CardContent = apps.get_model('cards', 'CardContent')
+
+    last_id = 0
+    while True:
+        cards = list(
+            Card.objects.filter(id__gt=last_id, content__isnull=True)
+            .order_by('id')
+            .only('id', *CONTENT_FIELDS)[:BATCH_SIZE]
+        )
+        if not cards:
+            break
+        last_id = cards[-1].id
+
+        values = {}
+        digests = []
+        for card in cards:
+            card_values = {field: getattr(card, field) for field in CONTENT_FIELDS}
+            digest = content_digest(card_values)
+            values.setdefault(digest, card_values)
+            digests.append(digest)
+
+        existing = set(CardContent.objects.filter(hash__in=values).values_list('hash', flat=True))
+        CardContent.objects.bulk_create(
+            [CardContent(hash=digest, **card_values) for digest, card_values in values.items() if digest not in existing]
+        )
+        content_ids = dict(CardContent.objects.filter(hash__in=values).values_list('hash', 'id'))
+
+        for card, digest in zip(cards, digests):
+            card.content_id = content_ids[digest]
+        Card.objects.bulk_update(cards, ['content'])
+
+
+def restore_inline_content(apps, schema_editor):
+    Card = apps.get_model('cards', 'Card')
+    for card in Card.objects.select_related('content').iterator(chunk_size=BATCH_SIZE):
+        for field in CONTENT_FIELDS:
+            setattr(card, field, getattr(card.content, field))
+        card.save(update_fields=list(CONTENT_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0007_cardcontent'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_content, restore_inline_content),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0008_populate_card_content'),
+    ]
+
+    operations = [
+        # Defaults let the reverse re-add the columns to existing rows before 0008 refills them
+        migrations.AlterField(
+            model_name='card',
+            name='front',
+            field=models.TextField(default=''),
+        ),
+        migrations.AlterField(
+            model_name='card',
+            name='back',
+            field=models.TextField(default=''),
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='back',
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='difficulty',
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='front',
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='hint',
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='tags',
+        ),
+        migrations.RemoveField(
+            model_name='card',
+            name='visual_payload',
+        ),
+        migrations.AlterField(
+            model_name='card',
+            name='content',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='cards', to='cards.cardcontent'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0009_remove_inline_card_content'),
+        ('decks', '0005_keyset_pagination_indexes'),
+        ('ingest', '0005_source_fetch_validators'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['deck', 'created_at', 'id'], name='card_deck_created_idx'),
+        ),
+    ]
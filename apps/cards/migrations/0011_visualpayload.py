@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisualPayload',
+            fields=[
+                ('hash', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('data', models.BinaryField()),
+                ('media_type', models.CharField(max_length=64)),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed size in bytes')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='cardcontent',
+            name='visual',
+            field=models.ForeignKey(blank=True, help_text='SVG code or JSON for generative UI', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='contents', to='cards.visualpayload'),
+        ),
+    ]
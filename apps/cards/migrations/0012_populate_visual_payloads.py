@@ -0,0 +1,60 @@
+import hashlib
+import zlib
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def move_visual_payloads(apps, schema_editor):
+    """
+    Moves inline visual payloads into compressed, content-addressed VisualPayload rows.
+    """
+    CardContent = apps.get_model('cards', 'CardContent')
+    VisualPayload = apps.get_model('cards', 'VisualPayload')
+
+    contents = (
+        CardContent.objects.exclude(visual_payload__isnull=True).exclude(visual_payload='')
+        .only('id', 'visual_payload').order_by('id')
+    )
+    last_id = 0
+    while True:
+        batch = list(contents.filter(id__gt=last_id)[:BATCH_SIZE])
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        payloads = {}
+        for content in batch:
+            text = content.visual_payload
+            content.visual_id = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            if content.visual_id not in payloads:
+                raw = text.encode('utf-8')
+                payloads[content.visual_id] = VisualPayload(
+                    hash=content.visual_id,
+                    data=zlib.compress(raw, 9),
+                    media_type='image/svg+xml' if text.lstrip().startswith('<') else 'application/json',
+                    size=len(raw),
+                )
+        VisualPayload.objects.bulk_create(payloads.values(), ignore_conflicts=True)
+        CardContent.objects.bulk_update(batch, ['visual'])
+
+
+def restore_visual_payloads(apps, schema_editor):
+    CardContent = apps.get_model('cards', 'CardContent')
+    VisualPayload = apps.get_model('cards', 'VisualPayload')
+
+    for payload in VisualPayload.objects.iterator():
+        text = zlib.decompress(bytes(payload.data)).decode('utf-8')
+        CardContent.objects.filter(visual_id=payload.hash).update(visual_payload=text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0011_visualpayload'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_visual_payloads, restore_visual_payloads),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0012_populate_visual_payloads'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='cardcontent',
+            name='visual_payload',
+        ),
+    ]
@@ -1,25 +1,195 @@
+import hashlib
+import json
+import zlib
 from django.db import models
 from django.utils import timezone
 from apps.decks.models import Deck
 from apps.ingest.models import Source
 
-class Card(models.Model):
+# Card fields stored on CardContent, with the value a card has when none is set
+CONTENT_DEFAULTS = {
+    'front': '',
+    'back': '',
+    'hint': None,
+    'difficulty': 'basic',
+    'tags': [],
+    'visual_payload': None,
+}
+CONTENT_FIELDS = tuple(CONTENT_DEFAULTS)
+# CardContent column behind each content-backed card field
+CONTENT_COLUMNS = {
+    **{field: field for field in CONTENT_FIELDS},
+    'visual_payload': 'visual',
+    'visual_hash': 'visual',
+}
+
+def card_only_fields(fields):
+    """
+    Maps card field names to .only() paths, following content fields through to CardContent.
+    Use together with select_related('content').
+    """
+    columns = (f'content__{CONTENT_COLUMNS[field]}' if field in CONTENT_COLUMNS else field for field in fields)
+    return list(dict.fromkeys(columns))
+
+def visual_digest(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class VisualPayloadManager(models.Manager):
+    def store(self, texts):
+        """
+        Returns the hash of each payload (None for empty ones), compressing and inserting
+        payloads not stored yet.
+        """
+        digests = [visual_digest(text) if text else None for text in texts]
+        pending = {digest: text for digest, text in zip(digests, texts) if digest}
+        if pending:
+            existing = set(self.filter(hash__in=list(pending)).values_list('hash', flat=True))
+            self.bulk_create(
+                [self.model.from_text(text, digest) for digest, text in pending.items() if digest not in existing],
+                ignore_conflicts=True
+            )
+        return digests
+
+class VisualPayload(models.Model):
+    """
+    Content-addressed, zlib-compressed SVG/JSON for card visuals. Kept out of the card and
+    content rows and served by its own immutable, cacheable endpoint.
+    """
+    hash = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    media_type = models.CharField(max_length=64)
+    size = models.PositiveIntegerField(help_text="Uncompressed size in bytes")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = VisualPayloadManager()
+
+    @classmethod
+    def from_text(cls, text, digest=None):
+        raw = text.encode('utf-8')
+        # SVG markup starts with '<' (an XML prolog or the svg element); anything else is JSON
+        media_type = 'image/svg+xml' if text.lstrip().startswith('<') else 'application/json'
+        return cls(
+            hash=digest or visual_digest(text),
+            data=zlib.compress(raw, 9),
+            media_type=media_type,
+            size=len(raw),
+        )
+
+    @property
+    def text(self):
+        return zlib.decompress(self.data).decode('utf-8')
+
+    def __str__(self):
+        return f"Visual {self.hash[:12]}"
+
+def content_digest(values):
+    """
+    Content address for a set of card content values.
+    """
+    canonical = json.dumps([values[field] for field in CONTENT_FIELDS], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class CardContentManager(models.Manager):
+    def intern(self, values_list):
+        """
+        Returns one CardContent per values dict, reusing existing rows with the same digest.
+        Missing rows (and their visual payloads) are created in bulk, so this costs at most five queries.
+        """
+        digests = [content_digest(values) for values in values_list]
+        found = {content.hash: content for content in self.filter(hash__in=set(digests))}
+        missing = {}
+        for digest, values in zip(digests, values_list):
+            if digest not in found and digest not in missing:
+                missing[digest] = values
+        if missing:
+            visual_hashes = VisualPayload.objects.store([values['visual_payload'] for values in missing.values()])
+            missing = {
+                digest: self.model(
+                    hash=digest,
+                    visual_id=visual_hash,
+                    **{field: value for field, value in values.items() if field != 'visual_payload'}
+                )
+                for (digest, values), visual_hash in zip(missing.items(), visual_hashes)
+            }
+            # Another writer may insert the same content concurrently
+            self.bulk_create(missing.values(), ignore_conflicts=True)
+            found.update((content.hash, content) for content in self.filter(hash__in=list(missing)))
+        return [found[digest] for digest in digests]
+
+class CardContent(models.Model):
+    """
+    Immutable, content-addressed card text. Forks share rows with their parent deck;
+    editing a card points it at a new (or existing identical) row instead of mutating this one.
+    """
     class Difficulty(models.TextChoices):
         BASIC = 'basic', 'Basic'
         INTERMEDIATE = 'intermediate', 'Intermediate'
         ADVANCED = 'advanced', 'Advanced'
-    
-    deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name='cards')
-    source = models.ForeignKey(Source, on_delete=models.SET_NULL, null=True, blank=True, related_name='cards')
+
+    hash = models.CharField(max_length=64, unique=True)
     front = models.TextField()
     back = models.TextField()
     hint = models.TextField(blank=True, null=True, help_text="Optional hint to aid recall")
     difficulty = models.CharField(max_length=20, choices=Difficulty.choices, default=Difficulty.BASIC)
     tags = models.JSONField(default=list, blank=True, help_text="Topic tags for organization")
-    visual_payload = models.TextField(blank=True, null=True, help_text="SVG code or JSON for generative UI")
+    visual = models.ForeignKey(
+        VisualPayload, on_delete=models.PROTECT, null=True, blank=True, related_name='contents',
+        help_text="SVG code or JSON for generative UI"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CardContentManager()
+
+    def __str__(self):
+        return f"Content {self.hash[:12]}"
+
+def _content_property(field):
+    def getter(self):
+        edits = self.__dict__.get('_content_edits')
+        if edits and field in edits:
+            return edits[field]
+        if self.content_id is None:
+            return CONTENT_DEFAULTS[field]
+        if field == 'visual_payload':
+            # Loaded on access only; API responses link to the visual endpoint instead
+            visual_id = self.content.visual_id
+            return VisualPayload.objects.get(hash=visual_id).text if visual_id else None
+        return getattr(self.content, field)
+
+    def setter(self, value):
+        self.__dict__.setdefault('_content_edits', {})[field] = value
+
+    return property(getter, setter)
+
+class Card(models.Model):
+    """
+    Per-deck scheduling state for a card. Text lives on the shared CardContent row;
+    front/back/hint/difficulty/tags/visual_payload read through to it, and assigning them
+    is copied on write when the card is saved.
+    """
+    Difficulty = CardContent.Difficulty
+    
+    deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name='cards')
+    source = models.ForeignKey(Source, on_delete=models.SET_NULL, null=True, blank=True, related_name='cards')
+    content = models.ForeignKey(CardContent, on_delete=models.PROTECT, related_name='cards')
     vector_id = models.CharField(max_length=255, blank=True, null=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='', help_text="Hash of front/back at last embedding")
     
-    # SM-2 Fields
+    front = _content_property('front')
+    back = _content_property('back')
+    hint = _content_property('hint')
+    difficulty = _content_property('difficulty')
+    tags = _content_property('tags')
+    visual_payload = _content_property('visual_payload')
+
+    @property
+    def visual_hash(self):
+        edits = self.__dict__.get('_content_edits')
+        if edits and 'visual_payload' in edits:
+            return visual_digest(edits['visual_payload']) if edits['visual_payload'] else None
+        return self.content.visual_id if self.content_id else None
+    
+    # SM-2 Fields (SCHEDULE_FIELDS below is what a review writes)
     sm2_ease = models.FloatField(default=2.5)
     sm2_interval = models.IntegerField(default=0)  # Days
     sm2_repetitions = models.IntegerField(default=0)
@@ -28,13 +198,63 @@ class Card(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    SCHEDULE_FIELDS = ('sm2_ease', 'sm2_interval', 'sm2_repetitions', 'next_review_at')
+
+    class Meta:
+        indexes = [
+            # Due-card lookups per deck (review sessions)
+            models.Index(fields=['deck', 'next_review_at'], name='card_deck_due_idx'),
+            # Keyset pagination of a deck's cards
+            models.Index(fields=['deck', 'created_at', 'id'], name='card_deck_created_idx'),
+        ]
+
     def __str__(self):
         return f"Card {self.id} in {self.deck.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        card = super().from_db(db, field_names, values)
+        # Deck as loaded, so a move to another deck can be detected on save
+        card._loaded_deck_id = card.__dict__.get('deck_id')
+        return card
+
+    def _pending_content(self):
+        return {field: getattr(self, field) for field in CONTENT_FIELDS}
+
+    @classmethod
+    def resolve_contents(cls, cards):
+        """
+        Points unsaved content edits at interned CardContent rows in bulk.
+        Call before bulk_create/bulk_update, which bypass save().
+        """
+        pending = [card for card in cards if card.__dict__.get('_content_edits')]
+        if not pending:
+            return
+        contents = CardContent.objects.intern([card._pending_content() for card in pending])
+        for card, content in zip(pending, contents):
+            card.content = content
+            card._content_edits = {}
+
+    def save(self, *args, **kwargs):
+        # Copy on write: edited text never mutates content shared with other cards
+        if self.__dict__.get('_content_edits'):
+            self.resolve_contents([self])
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'content'}
+        super().save(*args, **kwargs)
+        self._loaded_deck_id = self.deck_id
+
+    def compute_content_hash(self):
+        return hashlib.sha256(f"{self.front}\n{self.back}".encode('utf-8')).hexdigest()
+
+    @property
+    def needs_embedding(self):
+        return not self.vector_id or self.content_hash != self.compute_content_hash()
+
 class ReviewLog(models.Model):
     card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='logs')
     rating = models.IntegerField()  # 0-5
-    reviewed_at = models.DateTimeField(auto_now_add=True)
+    reviewed_at = models.DateTimeField(default=timezone.now)
     
     def __str__(self):
         return f"Review {self.card.id} - {self.rating}"
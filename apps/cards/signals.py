@@ -0,0 +1,71 @@
+import threading
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.cards.models import Card
+from apps.conditional import invalidate_cached_responses
+
+# Card IDs deleted in the current thread, flushed to Qdrant once the transaction commits.
+# Cascaded deck deletes therefore produce one task rather than one per card.
+_pending_deletes = threading.local()
+
+
+def _flush_vector_deletes():
+    card_ids = getattr(_pending_deletes, 'card_ids', None)
+    _pending_deletes.card_ids = None
+    if card_ids:
+        from apps.cards.tasks import delete_card_vectors
+        delete_card_vectors.delay(card_ids)
+
+
+@receiver(post_delete, sender=Card)
+def queue_vector_delete(sender, instance, **kwargs):
+    if not instance.vector_id:
+        return
+    card_ids = getattr(_pending_deletes, 'card_ids', None)
+    if card_ids is None:
+        card_ids = _pending_deletes.card_ids = []
+    card_ids.append(instance.id)
+    transaction.on_commit(_flush_vector_deletes)
+
+
+@receiver(post_save, sender=Card)
+def queue_reembed_on_edit(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Re-embed an edited card only when its front/back actually changed.
+    New cards are embedded in batches by whoever creates them.
+    """
+    # Reviews save only scheduling fields; skip them without loading the card's text
+    if update_fields is not None and 'content' not in update_fields:
+        return
+    if created or not instance.vector_id:
+        return
+    if instance.content_hash == instance.compute_content_hash():
+        return
+    from apps.cards.tasks import embed_cards
+    card_id = instance.id
+    transaction.on_commit(lambda: embed_cards.delay([card_id]))
+
+
+@receiver(post_save, sender=Card)
+def queue_payload_update_on_move(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Point the card's Qdrant payload (deck_id/owner_id) at its new deck when it moves,
+    so filtered searches stop returning it under the old deck.
+    """
+    if update_fields is not None and 'deck' not in update_fields:
+        return
+    if created or not instance.vector_id:
+        return
+    loaded_deck_id = instance.__dict__.get('_loaded_deck_id')
+    if loaded_deck_id is None or loaded_deck_id == instance.deck_id:
+        return
+    from apps.cards.tasks import update_card_payloads
+    card_id = instance.id
+    transaction.on_commit(lambda: update_card_payloads.delay([card_id]))
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def invalidate_card_responses(sender, **kwargs):
+    invalidate_cached_responses('cards')
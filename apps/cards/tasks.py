@@ -1,91 +1,421 @@
-from celery import shared_task
+import os
+import tempfile
+import time
+from collections import Counter
+from celery import shared_task, chord
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
 from apps.ingest.models import Source
 from apps.cards.models import Card
-from services.llm import LLMService
+from apps.conditional import invalidate_cached_responses
+from apps.serializers import CardSerializer
+from services.llm import EmbeddingError, LLMService, card_key, dedupe_cards
+from services.chunking import chunk_text
+from services.events import publish_source_event
+from services.pdf import describe_pages, extract_pages, is_pdf, page_count, page_groups
 from services.vector import VectorService
+from services.embedding_cache import get_embedding_cache
+
+# Card fields sent with cards_created events, so clients can render new cards without fetching them
+CREATED_CARD_EVENT_FIELDS = ('id', 'front', 'back', 'hint', 'difficulty', 'tags', 'next_review_at')
+
+def insert_generated_cards(source, cards_data):
+    """
+    Insert generated card dicts for a source. Returns the new card IDs; callers follow up
+    with announce_created_cards.
+    """
+    cards = [
+        Card(
+            deck_id=source.deck_id,
+            source=source,
+            front=card_data['front'],
+            back=card_data['back'],
+            hint=card_data.get('hint'),
+            difficulty=card_data.get('difficulty', 'basic'),
+            tags=card_data.get('tags', []),
+            visual_payload=card_data.get('visual_payload')
+        )
+        for card_data in cards_data
+    ]
+    Card.resolve_contents(cards)
+    return [card.id for card in Card.objects.bulk_create(cards)]
+
+def announce_created_cards(source, card_ids):
+    """
+    Follow-up for newly inserted cards: invalidate cached card lists, record time-to-first-card,
+    publish the progress event (with the cards' list fields) and queue embedding, once per batch.
+    """
+    if not card_ids:
+        return
+    invalidate_cached_responses('cards')
+    record_first_card(source)
+    cards = Card.objects.filter(id__in=card_ids).select_related('content').order_by('id')
+    publish_source_event(
+        source.id, "cards_created", count=len(card_ids), card_ids=card_ids,
+        cards=CardSerializer(cards, many=True, fields=CREATED_CARD_EVENT_FIELDS).data
+    )
+    
+    # Trigger embedding generation
+    embed_cards.delay(card_ids)
+
+def save_generated_cards(source, cards_data):
+    """
+    Persist generated card dicts for a source and queue their embedding.
+    Returns the new card IDs.
+    """
+    created_card_ids = insert_generated_cards(source, cards_data)
+    announce_created_cards(source, created_card_ids)
+    return created_card_ids
+
+def record_first_card(source):
+    """
+    Store time-to-first-card on the source the first time any of its cards is saved.
+    """
+    if source.time_to_first_card is not None:
+        return
+    elapsed = (timezone.now() - source.created_at).total_seconds()
+    if Source.objects.filter(id=source.id, time_to_first_card__isnull=True).update(time_to_first_card=elapsed):
+        source.time_to_first_card = elapsed
+        print(f"[AI] First card for source {source.id} after {elapsed:.1f}s")
+    else:
+        # Another task got there first
+        source.time_to_first_card = Source.objects.values_list('time_to_first_card', flat=True).get(id=source.id)
+
+def save_streamed_cards(source, cards):
+    """
+    Save cards from a streamed generation as they arrive, skipping repeated questions.
+    Each card is inserted as soon as it is complete; the first is announced at once (it sets
+    time-to-first-card), the rest in batches of GENERATION_STREAM_BATCH_CARDS or every
+    GENERATION_STREAM_BATCH_SECONDS, so embedding stays batched. If the stream fails, the cards
+    saved so far are announced before the error propagates.
+    Returns the new card IDs.
+    """
+    seen = set()
+    created_card_ids = []
+    pending = []
+    last_announced = time.monotonic()
+    try:
+        for card_data in cards:
+            key = card_key(card_data['front'])
+            if key in seen:
+                continue
+            seen.add(key)
+            pending += insert_generated_cards(source, [card_data])
+            if (
+                not created_card_ids
+                or len(pending) >= settings.GENERATION_STREAM_BATCH_CARDS
+                or time.monotonic() - last_announced >= settings.GENERATION_STREAM_BATCH_SECONDS
+            ):
+                announce_created_cards(source, pending)
+                created_card_ids += pending
+                pending = []
+                last_announced = time.monotonic()
+    finally:
+        # Cards saved before a failed stream still get their event and embeddings
+        announce_created_cards(source, pending)
+    return created_card_ids + pending
+
+def append_error_log(source_id, message):
+    """
+    Append to a source's error log in one UPDATE, without rewriting its other fields.
+    """
+    Source.objects.filter(id=source_id).update(
+        error_log=Concat('error_log', Value(f"\nGeneration Error: {message}")),
+        updated_at=timezone.now()
+    )
 
 @shared_task
-def generate_cards_from_source(source_id, is_vision=False):
+def generate_cards_from_source(source_id, is_vision=False, use_cache=True, vision_pages=None):
     """
     Generate flashcards from a source using Gemini AI.
+    Long texts are split into chunks and long PDFs into page groups, generated in parallel as a chord.
+    use_cache=False bypasses cached LLM responses.
+    vision_pages (page indices) marks a PDF whose other pages were extracted as text: both parts
+    are generated in the same chord and deduped against each other.
     """
     try:
         source = Source.objects.get(id=source_id)
-        llm = LLMService()
         
         print(f"[AI] Generating cards for source {source_id}, is_vision={is_vision}")
+        publish_source_event(source_id, "generating", vision=is_vision)
+
+        vision_file = is_vision and source.file
+        chunks = []
+        if not vision_file or vision_pages is not None:
+            chunks = chunk_text(source.extracted_text, max_chars=settings.GENERATION_CHUNK_CHARS)
+        groups = vision_page_groups(source, vision_pages) if vision_file else []
+
+        if groups or len(chunks) > 1:
+            fan_out_generation(source, chunks, groups, use_cache)
+            return
         
-        if is_vision and source.file:
+        # Stream the response so each card is saved and embedded as soon as it is complete
+        llm = LLMService()
+        if vision_file:
             # Use vision API for files (images/PDFs)
             file_path = source.file.path
-            cards_data = llm.generate_cards_from_file(file_path)
+            cards = llm.stream_cards_from_file(file_path)
         else:
             # Use text-based generation
-            cards_data = llm.generate_cards(source.extracted_text)
+            cards = llm.stream_cards(source.extracted_text, use_cache=use_cache)
         
-        print(f"[AI] Generated {len(cards_data)} cards")
-        
-        created_card_ids = []
-        for card_data in cards_data:
-            card = Card.objects.create(
-                deck=source.deck,
-                source=source,
-                front=card_data['front'],
-                back=card_data['back'],
-                hint=card_data.get('hint'),
-                difficulty=card_data.get('difficulty', 'basic'),
-                tags=card_data.get('tags', []),
-                visual_payload=card_data.get('visual_payload')
-            )
-            created_card_ids.append(card.id)
-            
-        # Trigger embedding generation
-        embed_cards.delay(created_card_ids)
+        created_card_ids = save_streamed_cards(source, cards)
         
         print(f"[AI] Created {len(created_card_ids)} cards, embedding triggered")
+        publish_source_event(source_id, "generated", cards=len(created_card_ids))
         
     except Exception as e:
         print(f"[AI] Error generating cards: {e}")
-        source.error_log = (source.error_log or "") + f"\nGeneration Error: {str(e)}"
-        source.save()
+        publish_source_event(source_id, "failed", error=str(e))
+        append_error_log(source_id, str(e))
         raise e
 
+def vision_page_groups(source, pages=None):
+    """
+    Page groups for vision generation of a PDF: `pages`, or all pages of a PDF longer than
+    PDF_PAGES_PER_RANGE, in groups of at most PDF_PAGES_PER_RANGE. Scattered pages are packed
+    together, so each group is one upload and one Gemini call.
+    Returns [] for non-PDFs and whole PDFs that fit in one call.
+    """
+    path = source.file.path
+    if not is_pdf(path):
+        return []
+    if pages is None:
+        count = page_count(path)
+        if count <= settings.PDF_PAGES_PER_RANGE:
+            return []
+        pages = range(count)
+    return page_groups(pages, settings.PDF_PAGES_PER_RANGE)
+
+def fan_out_generation(source, chunks, groups, use_cache=True):
+    """
+    Generate text chunks and PDF page groups in parallel as one chord, merged by merge_source_cards.
+    """
+    if groups:
+        source.page_ranges = [
+            {"pages": [page + 1 for page in pages], "status": "PENDING", "cards": 0, "error": None}
+            for pages in groups
+        ]
+        source.save(update_fields=['page_ranges', 'updated_at'])
+    print(f"[AI] Fanning out {len(chunks)} chunks and {len(groups)} page groups for source {source.id}")
+    chord(
+        [generate_chunk_cards.s(source.id, index, chunk, use_cache=use_cache) for index, chunk in enumerate(chunks)]
+        + [generate_page_range_cards.s(source.id, index, pages) for index, pages in enumerate(groups)]
+    )(merge_source_cards.s(source.id))
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=10)
+def generate_chunk_cards(self, source_id, chunk_index, chunk, use_cache=True):
+    """
+    Map step: generate cards for one chunk of a long source.
+    A chunk that still fails after retries yields no cards instead of failing the chord.
+    """
+    try:
+        cards_data = LLMService().generate_cards(chunk, use_cache=use_cache)
+        print(f"[AI] Source {source_id} chunk {chunk_index}: {len(cards_data)} cards")
+        return {"index": chunk_index, "cards": cards_data, "error": None}
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        print(f"[AI] Source {source_id} chunk {chunk_index} failed: {e}")
+        return {"index": chunk_index, "cards": [], "error": str(e)}
+
+def update_page_range(source_id, range_index, **changes):
+    """
+    Record progress for one page group; rows are locked so concurrent groups don't clobber each other.
+    """
+    with transaction.atomic():
+        source = Source.objects.select_for_update().only('id', 'page_ranges').get(id=source_id)
+        source.page_ranges[range_index].update(changes)
+        source.save(update_fields=['page_ranges', 'updated_at'])
+    publish_source_event(source_id, "page_range", index=range_index, **changes)
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=10)
+def generate_page_range_cards(self, source_id, range_index, pages):
+    """
+    Map step: copy one group of PDF pages into a sub-PDF, generate cards from it and save them
+    right away, so early groups show up before the whole document is done.
+    A group that still fails after retries yields no cards instead of failing the chord.
+    """
+    source = Source.objects.get(id=source_id)
+    label = describe_pages(pages)
+    update_page_range(source_id, range_index, status="PROCESSING")
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            group_path = os.path.join(tmp_dir, f"source-{source_id}-pages-{label.replace(', ', '_')}.pdf")
+            extract_pages(source.file.path, pages, group_path)
+            cards_data = LLMService().generate_cards_from_file(group_path)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        print(f"[AI] Source {source_id} pages {label} failed: {e}")
+        update_page_range(source_id, range_index, status="FAILED", error=str(e))
+        return {"index": range_index, "pages": pages, "card_ids": [], "error": str(e)}
+
+    created_card_ids = save_generated_cards(source, dedupe_cards(cards_data))
+    update_page_range(source_id, range_index, status="COMPLETED", cards=len(created_card_ids))
+    print(f"[AI] Source {source_id} pages {label}: {len(created_card_ids)} cards")
+    return {"index": range_index, "pages": pages, "card_ids": created_card_ids, "error": None}
+
 @shared_task
-def embed_cards(card_ids):
+def merge_source_cards(results, source_id):
+    """
+    Reduce step for fanned-out generation. Page groups have already saved their cards, so those
+    repeating an earlier group's question are removed (first in document order wins). Text chunk
+    cards are then deduped against the kept cards and each other, and saved.
+    """
+    source = Source.objects.get(id=source_id)
+    groups = sorted((result for result in results if "card_ids" in result), key=lambda result: result["index"])
+    chunks = sorted((result for result in results if "cards" in result), key=lambda result: result["index"])
+
+    card_ids = [card_id for result in groups for card_id in result["card_ids"]]
+    fronts = dict(
+        Card.objects.filter(id__in=card_ids).values_list('id', 'content__front')
+    )
+    seen = set()
+    kept_ids, duplicate_ids = [], []
+    for card_id in card_ids:
+        if card_id not in fronts:
+            continue
+        key = card_key(fronts[card_id])
+        if key in seen:
+            duplicate_ids.append(card_id)
+        else:
+            seen.add(key)
+            kept_ids.append(card_id)
+    if duplicate_ids:
+        Card.objects.filter(id__in=duplicate_ids).delete()
+
+    cards_data = dedupe_cards([
+        card for result in chunks for card in result["cards"] if card_key(card["front"]) not in seen
+    ])
+    created_card_ids = save_generated_cards(source, cards_data) if cards_data else []
+
+    errors = [f"Chunk {result['index']}: {result['error']}" for result in chunks if result["error"]]
+    errors += [f"Pages {describe_pages(result['pages'])}: {result['error']}" for result in groups if result["error"]]
+    if errors:
+        append_error_log(source_id, "; ".join(errors))
+
+    print(f"[AI] Merged {len(chunks)} chunks and {len(groups)} page groups into "
+          f"{len(kept_ids) + len(created_card_ids)} cards for source {source_id} "
+          f"({len(duplicate_ids)} cross-group duplicates removed)")
+    publish_source_event(
+        source_id, "generated", cards=len(kept_ids) + len(created_card_ids), removed_card_ids=duplicate_ids
+    )
+    return kept_ids + created_card_ids
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def embed_cards(self, card_ids):
     """
     Generate real embeddings for cards using Gemini and store in Qdrant.
+    Cards are loaded in one query, embedded in batches and upserted together.
+    Cards whose front/back are unchanged since their last embedding are skipped.
+    Cards Gemini failed to embed are left unmarked and retried on their own.
     """
     print(f"[Vector] Embedding {len(card_ids)} cards")
     
+    failed_ids = []
     try:
+        cards = list(
+            Card.objects.filter(id__in=card_ids)
+            .select_related('content')
+            .only('id', 'deck_id', 'source_id', 'vector_id', 'content_hash', 'content__front', 'content__back')
+            .annotate(owner_id=F('deck__owner_id'))
+        )
+        cards = [card for card in cards if card.needs_embedding]
+        if not cards:
+            print("[Vector] No cards need embedding")
+            return
+
         vector_service = VectorService()
         llm = LLMService()
         
-        for card_id in card_ids:
-            card = Card.objects.get(id=card_id)
-            
-            # Create text for embedding (front + back combined)
-            embed_text = f"{card.front}\n{card.back}"
-            
-            # Get real embedding from Gemini
-            embedding = llm.get_embedding(embed_text)
-            
-            # Store in Qdrant
-            vector_service.upsert_card(
-                card_id=card.id,
-                vector=embedding,
-                payload={
-                    "front": card.front, 
-                    "back": card.back, 
-                    "deck_id": card.deck.id
-                }
-            )
-            
-            card.vector_id = str(card.id)
-            card.save()
-            
-        print(f"[Vector] Successfully embedded {len(card_ids)} cards")
+        # Create text for embedding (front + back combined)
+        embed_texts = [f"{card.front}\n{card.back}" for card in cards]
+        
+        # Get real embeddings from Gemini, batched; duplicates come from the cache
+        embeddings = llm.get_embeddings(embed_texts, allow_partial=True)
+        print(f"[Vector] Embedding cache stats: {get_embedding_cache().stats()}")
+
+        # Failed cards keep their old hash, so needs_embedding stays true for them
+        failed_ids = [card.id for card, embedding in zip(cards, embeddings) if embedding is None]
+        embedded = [(card, embedding) for card, embedding in zip(cards, embeddings) if embedding is not None]
+        cards = [card for card, _ in embedded]
+
+        if embedded:
+            # Store in Qdrant as a single multi-point upsert
+            vector_service.upsert_cards([
+                (
+                    card.id,
+                    embedding,
+                    {
+                        "front": card.front,
+                        "back": card.back,
+                        "deck_id": card.deck_id,
+                        "owner_id": card.owner_id
+                    }
+                )
+                for card, embedding in embedded
+            ])
+
+            now = timezone.now()
+            for card in cards:
+                card.vector_id = str(vector_service.point_id(card.id))
+                card.content_hash = card.compute_content_hash()
+                card.updated_at = now
+            Card.objects.bulk_update(cards, ['vector_id', 'content_hash', 'updated_at'])
+            invalidate_cached_responses('cards')
+
+            print(f"[Vector] Successfully embedded {len(cards)} cards")
+            for source_id, count in Counter(card.source_id for card in cards if card.source_id).items():
+                publish_source_event(source_id, "embedded", count=count)
         
     except Exception as e:
         print(f"[Vector] Error embedding cards: {e}")
         raise e
+
+    if failed_ids:
+        print(f"[Vector] {len(failed_ids)} cards failed to embed, retrying")
+        raise self.retry(args=(failed_ids,), exc=EmbeddingError(f"{len(failed_ids)} cards could not be embedded"))
+
+@shared_task
+def update_card_payloads(card_ids):
+    """
+    Rewrite deck_id/owner_id in the Qdrant payloads of cards that moved to another deck,
+    so deck- and owner-filtered searches follow the move.
+    """
+    moves = (
+        Card.objects.filter(id__in=card_ids, vector_id__isnull=False)
+        .values_list('deck_id', 'deck__owner_id', 'id')
+    )
+    by_deck = {}
+    for deck_id, owner_id, card_id in moves:
+        by_deck.setdefault((deck_id, owner_id), []).append(card_id)
+
+    try:
+        vector_service = VectorService()
+        for (deck_id, owner_id), ids in by_deck.items():
+            vector_service.set_card_payload(ids, {"deck_id": deck_id, "owner_id": owner_id})
+        print(f"[Vector] Updated payloads of {sum(map(len, by_deck.values()))} moved cards")
+    except Exception as e:
+        print(f"[Vector] Error updating card payloads: {e}")
+
+@shared_task
+def delete_card_vectors(card_ids):
+    """
+    Remove Qdrant points for deleted cards.
+    IDs of cards that still exist (e.g. from a rolled-back delete) are ignored.
+    """
+    existing = set(Card.objects.filter(id__in=card_ids).values_list('id', flat=True))
+    stale_ids = [card_id for card_id in card_ids if card_id not in existing]
+    if not stale_ids:
+        return
+
+    try:
+        VectorService().delete_cards(stale_ids)
+        print(f"[Vector] Deleted {len(stale_ids)} card vectors")
+    except Exception as e:
+        print(f"[Vector] Error deleting card vectors: {e}")
+        raise e
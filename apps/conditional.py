@@ -0,0 +1,166 @@
+import hashlib
+import threading
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+# Response-cache scopes written in the current thread, bumped once the transaction commits
+_pending_invalidations = threading.local()
+
+
+def _generation_key(scope):
+    return f"api:generation:{scope}"
+
+
+def _flush_invalidations():
+    scopes = getattr(_pending_invalidations, 'scopes', None)
+    _pending_invalidations.scopes = None
+    for scope in scopes or ():
+        key = _generation_key(scope)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+        except Exception as e:
+            print(f"[API Cache] Invalidating {scope} failed: {e}")
+
+
+def invalidate_cached_responses(*scopes):
+    """
+    Drops cached responses for the given scopes after the current transaction commits
+    (immediately outside one). Writes that bypass model signals (bulk_create, bulk_update,
+    QuerySet.update, raw SQL) must call this themselves.
+    """
+    if not settings.API_RESPONSE_CACHE_TTL:
+        return
+    pending = getattr(_pending_invalidations, 'scopes', None)
+    if pending is None:
+        pending = _pending_invalidations.scopes = set()
+    pending.update(scopes)
+    transaction.on_commit(_flush_invalidations)
+
+
+def _request_fingerprint(request):
+    # Plain Django (async) views have no content negotiation and always render JSON
+    media_type = getattr(request, 'accepted_media_type', 'application/json')
+    return f"{request.user.pk}:{media_type}:{request.get_full_path()}"
+
+
+def _response_cache_key(request, scope):
+    generation = cache.get_or_set(_generation_key(scope), 0, timeout=None)
+    digest = hashlib.sha1(_request_fingerprint(request).encode('utf-8')).hexdigest()
+    return f"api:response:{scope}:{generation}:{digest}"
+
+
+def queryset_etag(request, queryset):
+    """
+    Strong ETag for a response rendered from queryset: one COUNT/MAX(updated_at) query,
+    combined with everything about the request that shapes the body.
+    """
+    fingerprint = queryset.order_by().aggregate(count=Count('pk'), last_update=Max('updated_at'))
+    return _fingerprint_etag(request, queryset, fingerprint)
+
+
+async def aqueryset_etag(request, queryset):
+    """
+    queryset_etag for async views.
+    """
+    fingerprint = await queryset.order_by().aaggregate(count=Count('pk'), last_update=Max('updated_at'))
+    return _fingerprint_etag(request, queryset, fingerprint)
+
+
+def _fingerprint_etag(request, queryset, fingerprint):
+    last_update = fingerprint['last_update'].timestamp() if fingerprint['last_update'] else 0
+    raw = f"{queryset.model._meta.label}:{fingerprint['count']}:{last_update}:{_request_fingerprint(request)}"
+    return f'"{hashlib.sha1(raw.encode("utf-8")).hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    # If-None-Match uses weak comparison, so compression middleware's W/ prefix still matches
+    etags = parse_etags(header)
+    return '*' in etags or any(tag.removeprefix('W/') == etag for tag in etags)
+
+
+def add_validators(response, etag):
+    response['ETag'] = etag
+    # Clients may store the body but must revalidate before every reuse
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag):
+    return add_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+
+def conditional_response(request, queryset, render, cache_scope=None):
+    """
+    Answers a GET with 304 when If-None-Match matches, without calling render().
+    With a cache_scope and API_RESPONSE_CACHE_TTL set, rendered bodies are also cached in
+    Redis until a write to that scope; a cache hit costs no database queries at all.
+    """
+    cache_key = None
+    if cache_scope and settings.API_RESPONSE_CACHE_TTL:
+        try:
+            cache_key = _response_cache_key(request, cache_scope)
+            cached = cache.get(cache_key)
+        except Exception as e:
+            print(f"[API Cache] Lookup failed: {e}")
+            cache_key, cached = None, None
+        if cached is not None:
+            etag, content, content_type = cached
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return add_validators(HttpResponse(content, content_type=content_type), etag)
+
+    etag = queryset_etag(request, queryset)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = render()
+    if response.status_code != status.HTTP_200_OK:
+        return response
+    add_validators(response, etag)
+
+    if cache_key:
+        def store(rendered):
+            try:
+                cache.set(
+                    cache_key, (etag, rendered.content, rendered['Content-Type']),
+                    timeout=settings.API_RESPONSE_CACHE_TTL
+                )
+            except Exception as e:
+                print(f"[API Cache] Store failed: {e}")
+        response.add_post_render_callback(store)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / If-None-Match support for list and retrieve. Set cache_scope to also cache
+    rendered responses; the scope is invalidated by signals on writes to its models.
+    """
+    cache_scope = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return conditional_response(
+            request, queryset, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+            cache_scope=self.cache_scope
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        return conditional_response(
+            request, queryset, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+            cache_scope=self.cache_scope
+        )
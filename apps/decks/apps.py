@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class DecksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.decks'
+
+    def ready(self):
+        from apps.decks import signals  # noqa: F401
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('decks', '0003_deck_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deck',
+            name='fork_copied',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='deck',
+            name='fork_status',
+            field=models.CharField(choices=[('READY', 'Ready'), ('COPYING', 'Copying'), ('FAILED', 'Failed')], default='READY', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='deck',
+            name='fork_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('decks', '0004_deck_fork_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deck',
+            index=models.Index(fields=['created_at', 'id'], name='deck_created_idx'),
+        ),
+    ]
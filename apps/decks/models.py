@@ -1,7 +1,13 @@
 from django.db import models
 from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 
 class Deck(models.Model):
+    class ForkStatus(models.TextChoices):
+        READY = 'READY', _('Ready')
+        COPYING = 'COPYING', _('Copying')
+        FAILED = 'FAILED', _('Failed')
+
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, default='')
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='decks')
@@ -9,5 +15,16 @@ class Deck(models.Model):
     parent_deck = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='forks', help_text="Original deck if this is a fork")
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Progress of copying cards into a fork; large forks are copied in the background
+    fork_status = models.CharField(max_length=20, choices=ForkStatus.choices, default=ForkStatus.READY)
+    fork_copied = models.PositiveIntegerField(default=0)
+    fork_total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of deck lists
+            models.Index(fields=['created_at', 'id'], name='deck_created_idx'),
+        ]
+
     def __str__(self):
         return self.name
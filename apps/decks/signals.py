@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.conditional import invalidate_cached_responses
+from apps.decks.models import Deck
+
+
+@receiver(post_save, sender=Deck)
+@receiver(post_delete, sender=Deck)
+def invalidate_deck_responses(sender, **kwargs):
+    invalidate_cached_responses('decks')
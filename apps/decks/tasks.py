@@ -0,0 +1,112 @@
+from celery import shared_task
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.cards.models import Card
+from apps.conditional import invalidate_cached_responses
+from apps.decks.models import Deck
+
+# Per-card columns a fork shares with the original; content (and so hint/difficulty/tags)
+# is shared by reference, scheduling state starts fresh for the new owner
+FORK_COPIED_COLUMNS = ('source_id', 'content_id')
+
+
+def _copy_chunk_sql(original_deck_id, forked_deck_id, after_id, upto_id):
+    """
+    Copies one id range of the original deck's cards with a single INSERT ... SELECT.
+    Returns the new card IDs.
+    """
+    now = timezone.now()
+    card = Card._meta
+    quote = connection.ops.quote_name
+    fresh = {
+        'deck_id': forked_deck_id,
+        'vector_id': None,
+        'content_hash': '',
+        'sm2_ease': card.get_field('sm2_ease').default,
+        'sm2_interval': card.get_field('sm2_interval').default,
+        'sm2_repetitions': card.get_field('sm2_repetitions').default,
+        'next_review_at': now,
+        'created_at': now,
+        'updated_at': now,
+    }
+    columns = [*fresh, *FORK_COPIED_COLUMNS]
+    sql = (
+        f"INSERT INTO {quote(card.db_table)} ({', '.join(quote(column) for column in columns)}) "
+        f"SELECT {', '.join(['%s'] * len(fresh) + [quote(column) for column in FORK_COPIED_COLUMNS])} "
+        f"FROM {quote(card.db_table)} WHERE {quote('deck_id')} = %s AND {quote('id')} > %s AND {quote('id')} <= %s "
+        f"ORDER BY {quote('id')} "
+        f"RETURNING {quote('id')}"
+    )
+    params = [
+        *(card.get_field(column).get_db_prep_save(value, connection) for column, value in fresh.items()),
+        original_deck_id, after_id, upto_id,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _copy_chunk_orm(original_deck_id, forked_deck_id, after_id, upto_id):
+    """
+    Fallback for backends without INSERT ... RETURNING: one chunk through bulk_create.
+    """
+    rows = (
+        Card.objects.filter(deck_id=original_deck_id, id__gt=after_id, id__lte=upto_id)
+        .order_by('id')
+        .values_list(*FORK_COPIED_COLUMNS)
+        .iterator()
+    )
+    new_cards = Card.objects.bulk_create([
+        Card(deck_id=forked_deck_id, **dict(zip(FORK_COPIED_COLUMNS, row)))
+        for row in rows
+    ])
+    return [card.id for card in new_cards]
+
+
+def copy_deck_cards(original_deck_id, forked_deck_id, chunk_size=None):
+    """
+    Copies every card of the original deck into the fork, one keyset-bounded chunk at a time,
+    so memory stays flat regardless of deck size. Progress is recorded on the forked deck and
+    each chunk's cards are queued for embedding as soon as they exist.
+    Returns the number of cards copied.
+    """
+    from apps.cards.tasks import embed_cards
+
+    chunk_size = chunk_size or settings.FORK_CHUNK_SIZE
+    copy_chunk = _copy_chunk_sql if connection.features.can_return_columns_from_insert else _copy_chunk_orm
+    original_ids = Card.objects.filter(deck_id=original_deck_id).order_by('id').values_list('id', flat=True)
+
+    copied = 0
+    after_id = 0
+    while True:
+        bounds = list(original_ids.filter(id__gt=after_id)[:chunk_size])
+        if not bounds:
+            break
+        with transaction.atomic():
+            new_ids = copy_chunk(original_deck_id, forked_deck_id, after_id, bounds[-1])
+            copied += len(new_ids)
+            Deck.objects.filter(id=forked_deck_id).update(fork_copied=copied, updated_at=timezone.now())
+            invalidate_cached_responses('cards', 'decks')
+        after_id = bounds[-1]
+        if new_ids:
+            embed_cards.delay(new_ids)
+    return copied
+
+
+@shared_task
+def fork_deck_cards(original_deck_id, forked_deck_id):
+    """
+    Background copy for large forks. Clients poll the forked deck's fork_status/fork_copied.
+    """
+    print(f"[Fork] Copying deck {original_deck_id} into {forked_deck_id}")
+    try:
+        copied = copy_deck_cards(original_deck_id, forked_deck_id)
+        Deck.objects.filter(id=forked_deck_id).update(fork_status=Deck.ForkStatus.READY, updated_at=timezone.now())
+        invalidate_cached_responses('decks')
+        print(f"[Fork] Copied {copied} cards into deck {forked_deck_id}")
+    except Exception as e:
+        print(f"[Fork] Copy into deck {forked_deck_id} failed: {e}")
+        Deck.objects.filter(id=forked_deck_id).update(fork_status=Deck.ForkStatus.FAILED, updated_at=timezone.now())
+        invalidate_cached_responses('decks')
+        raise
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingest', '0005_source_fetch_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='page_ranges',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingest', '0006_source_page_ranges'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='original_bytes',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='source',
+            name='upload_bytes',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
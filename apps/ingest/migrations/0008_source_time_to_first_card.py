@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ingest', '0007_source_upload_sizes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='source',
+            name='time_to_first_card',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('decks', '0005_keyset_pagination_indexes'),
+        ('ingest', '0008_source_time_to_first_card'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='source',
+            index=models.Index(fields=['created_at', 'id'], name='source_created_idx'),
+        ),
+    ]
@@ -9,7 +9,7 @@ class Source(models.Model):
         COMPLETED = 'COMPLETED', _('Completed')
         FAILED = 'FAILED', _('Failed')
 
-    url = models.URLField(max_length=500, blank=True, null=True)
+    url = models.URLField(max_length=500, blank=True, null=True, db_index=True)
     deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name='sources')
     file = models.FileField(upload_to='uploads/', blank=True, null=True)
     status = models.CharField(
@@ -19,8 +19,31 @@ class Source(models.Model):
     )
     extracted_text = models.TextField(blank=True)
     error_log = models.TextField(blank=True)
+
+    # Fetch validators, reused for conditional GETs when the same URL is ingested again
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    fetched_at = models.DateTimeField(blank=True, null=True)
+
+    # Progress of split-PDF generation, one entry per page group:
+    # [{"pages": [1-based page numbers in the group], "status", "cards", "error"}]
+    page_ranges = models.JSONField(default=list, blank=True)
+
+    # Uploaded image size before and after preprocessing for vision
+    original_bytes = models.PositiveBigIntegerField(blank=True, null=True)
+    upload_bytes = models.PositiveBigIntegerField(blank=True, null=True)
+
+    # Seconds from submission until the first generated card was saved
+    time_to_first_card = models.FloatField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of source lists
+            models.Index(fields=['created_at', 'id'], name='source_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.url} ({self.status})"
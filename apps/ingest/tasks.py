@@ -1,40 +1,169 @@
+import os
+from datetime import timedelta
 from celery import shared_task
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
 from apps.ingest.models import Source
-from services.ingest import fetch_url_content
+from services.events import publish_source_event
+from services.images import preprocess_image
+from services.ingest import fetch_url
+from services.pdf import has_text_layer, is_pdf, page_texts
 # from apps.cards.tasks import generate_cards_from_source # Circular import risk, use signature or string
 
+def find_previous_fetch(source):
+    """
+    Latest completed ingest of the same URL, if any.
+    """
+    return (
+        Source.objects.filter(url=source.url, status=Source.Status.COMPLETED)
+        .exclude(id=source.id)
+        .exclude(content_hash='')
+        .order_by('-fetched_at')
+        .first()
+    )
+
+def split_pdf_pages(path):
+    """
+    Splits a PDF into its text-layer pages and the pages that need vision.
+    Returns (text of the text pages, indices of the vision pages).
+    """
+    texts = page_texts(path)
+    vision_pages = [
+        index for index, text in enumerate(texts)
+        if not has_text_layer(text, settings.PDF_TEXT_MIN_CHARS)
+    ]
+    vision = set(vision_pages)
+    text = "\n\n".join(text.strip() for index, text in enumerate(texts) if index not in vision)
+    print(f"[Ingest] {path}: {len(texts) - len(vision_pages)} text pages, {len(vision_pages)} vision pages")
+    return text, vision_pages
+
+def preprocess_source_image(source):
+    """
+    Replaces an uploaded image with its downscaled, recompressed version when that is smaller,
+    recording the sizes before and after. Runs once per source.
+    """
+    if source.original_bytes is not None:
+        return
+    original_name = source.file.name
+    original_bytes = source.file.size
+    try:
+        data, extension = preprocess_image(
+            source.file.path,
+            max_side=settings.VISION_IMAGE_MAX_SIDE,
+            quality=settings.VISION_IMAGE_QUALITY,
+            grayscale=settings.VISION_IMAGE_GRAYSCALE,
+        )
+    except Exception as e:
+        print(f"[Ingest] Image preprocessing skipped for source {source.id}: {e}")
+        return
+
+    source.original_bytes = original_bytes
+    if len(data) >= original_bytes:
+        source.upload_bytes = original_bytes
+        return
+
+    name = os.path.splitext(os.path.basename(original_name))[0] + extension
+    source.file.save(name, ContentFile(data), save=False)
+    source.upload_bytes = len(data)
+    try:
+        source.save(update_fields=['file', 'original_bytes', 'upload_bytes'])
+    except Exception:
+        # The row still points at the original; drop the unreferenced replacement
+        source.file.storage.delete(source.file.name)
+        raise
+    # Only remove the original once the new path is committed
+    storage = source.file.storage
+    transaction.on_commit(lambda: storage.delete(original_name))
+    print(f"[Ingest] Preprocessed image for source {source.id}: {original_bytes} -> {len(data)} bytes")
+
 @shared_task
-def process_source_url(source_id):
+def process_source_url(source_id, use_cache=True):
     try:
         source = Source.objects.get(id=source_id)
         source.status = Source.Status.PROCESSING
         source.save()
         # Determine extraction strategy
-        text_content = ""
         is_vision = False
+        vision_pages = None
+        skip_generation = False
 
-        if source.file:
-            # Handle File Source (Images/PDFs)
+        if source.file and is_pdf(source.file.path):
+            # Use the PDF's own text layer where it has one; only the remaining pages go to vision
+            text, vision_pages = split_pdf_pages(source.file.path)
+            if text:
+                source.extracted_text = text
+            else:
+                source.extracted_text = "[File Content Processed via Vision API]"
+                vision_pages = None
+            is_vision = not text or bool(vision_pages)
+        elif source.file:
+            # Handle File Source (Images)
             is_vision = True
+            preprocess_source_image(source)
             source.extracted_text = "[File Content Processed via Vision API]"
         elif source.url:
-            # Handle URL Source
-            text = fetch_url_content(source.url)
-            source.extracted_text = text
-            text_content = text
+            # Handle URL Source, reusing a recent or unchanged previous fetch
+            previous = find_previous_fetch(source)
+            fresh_after = timezone.now() - timedelta(seconds=settings.FETCH_FRESHNESS_SECONDS)
+            if previous and previous.fetched_at and previous.fetched_at >= fresh_after:
+                print(f"[Ingest] {source.url} fetched recently by source {previous.id}, reusing")
+                unchanged = True
+            else:
+                result = fetch_url(
+                    source.url,
+                    etag=previous.etag if previous else '',
+                    last_modified=previous.last_modified if previous else '',
+                    previous_hash=previous.content_hash if previous else '',
+                )
+                unchanged = result.not_modified and previous is not None
+                source.content_hash = result.content_hash
+                source.etag = result.etag
+                source.last_modified = result.last_modified
+                source.fetched_at = timezone.now()
+
+            if unchanged:
+                source.extracted_text = previous.extracted_text
+                source.content_hash = previous.content_hash
+                source.etag = source.etag or previous.etag
+                source.last_modified = source.last_modified or previous.last_modified
+                source.fetched_at = source.fetched_at or previous.fetched_at
+                # Same content already turned into cards in this deck
+                skip_generation = previous.deck_id == source.deck_id and previous.cards.exists()
+            else:
+                source.extracted_text = result.text
         else:
             raise ValueError("Source has no URL and no Image.")
-            
+
         source.status = Source.Status.COMPLETED
         source.save()
-        
+        publish_source_event(source.id, "fetched", status=source.status, chars=len(source.extracted_text))
+
+        if skip_generation:
+            print(f"[Ingest] {source.url} unchanged since source {previous.id}, skipping generation")
+            publish_source_event(source.id, "generated", cards=0, skipped=True)
+            return
+
         # Trigger Card Generation
+        # A mixed PDF is one task: its text and vision pages are generated together and deduped
         from apps.cards.tasks import generate_cards_from_source
-        generate_cards_from_source.delay(source.id, is_vision=is_vision)
-        
+        generate_cards_from_source.delay(
+            source.id, is_vision=is_vision, use_cache=use_cache, vision_pages=vision_pages or None
+        )
+
     except Exception as e:
         source = Source.objects.get(id=source_id)
         source.status = Source.Status.FAILED
         source.error_log = str(e)
         source.save()
+        publish_source_event(source_id, "failed", status=source.status, error=str(e))
         raise e
+
+@shared_task
+def gc_gemini_uploads():
+    """
+    Periodic (celery beat): delete Gemini uploads that will not be reused.
+    """
+    from services.uploads import UploadManager
+    return UploadManager().collect_garbage()
@@ -0,0 +1,125 @@
+from datetime import timedelta
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from apps.cards.models import Card, ReviewLog
+from apps.conditional import invalidate_cached_responses
+from services.scheduler import DEFAULT_EASE, calculate_next_reviews, to_datetime64, to_datetimes
+
+
+class Command(BaseCommand):
+    help = "Bulk reschedule cards: reset, shift due dates, or replay ReviewLog history through SM-2."
+
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group(required=True)
+        mode.add_argument('--reset', action='store_true', help="Reset SM-2 state and make cards due now")
+        mode.add_argument('--shift-days', type=int, help="Move due dates by N days (e.g. after a vacation)")
+        mode.add_argument('--replay', action='store_true', help="Recompute SM-2 state from ReviewLog history")
+        parser.add_argument('--deck', type=int, action='append', help="Limit to deck ID (repeatable)")
+        parser.add_argument('--chunk-size', type=int, default=10000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+
+        qs = Card.objects.all()
+        if options['deck']:
+            qs = qs.filter(deck_id__in=options['deck'])
+
+        if options['reset']:
+            handler = self.reset_chunk
+        elif options['shift_days'] is not None:
+            handler = self.shift_chunk
+        else:
+            handler = self.replay_chunk
+
+        verb = "Would reschedule" if options['dry_run'] else "Rescheduled"
+        total = 0
+        last_id = 0
+        # Keyset iteration by ID keeps each chunk an index range scan
+        while True:
+            chunk_ids = list(
+                qs.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['chunk_size']]
+            )
+            if not chunk_ids:
+                break
+            last_id = chunk_ids[-1]
+            with transaction.atomic():
+                cards = list(Card.objects.filter(id__in=chunk_ids).order_by('id').only('id', *Card.SCHEDULE_FIELDS))
+                changed = handler(cards, options)
+                if changed and not options['dry_run']:
+                    for card in changed:
+                        card.updated_at = timezone.now()
+                    Card.objects.bulk_update(changed, [*Card.SCHEDULE_FIELDS, 'updated_at'], batch_size=2000)
+                    invalidate_cached_responses('cards')
+            total += len(changed)
+            self.stdout.write(f"[Scheduler] {verb} {total} cards (through id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"[Scheduler] {verb} {total} cards"))
+
+    def reset_chunk(self, cards, options):
+        now = timezone.now()
+        for card in cards:
+            card.sm2_ease = DEFAULT_EASE
+            card.sm2_interval = 0
+            card.sm2_repetitions = 0
+            card.next_review_at = now
+        return cards
+
+    def shift_chunk(self, cards, options):
+        shift = timedelta(days=options['shift_days'])
+        for card in cards:
+            card.next_review_at = card.next_review_at + shift
+        return cards
+
+    def replay_chunk(self, cards, options):
+        """
+        Replays every card's reviews in lockstep: step k applies each card's k-th review at once.
+        Cards without reviews are left untouched.
+        """
+        logs = list(
+            ReviewLog.objects.filter(card_id__in=[card.id for card in cards])
+            .order_by('card_id', 'reviewed_at', 'id')
+            .values_list('card_id', 'rating', 'reviewed_at')
+        )
+        if not logs:
+            return []
+
+        reviewed = sorted({card_id for card_id, _, _ in logs})
+        position = {card_id: i for i, card_id in enumerate(reviewed)}
+        log_cards = np.array([position[card_id] for card_id, _, _ in logs])
+        log_ratings = np.array([rating for _, rating, _ in logs])
+        log_times = to_datetime64([reviewed_at for _, _, reviewed_at in logs])
+
+        # Rank of each log within its card (logs are grouped by card)
+        starts = np.r_[0, np.flatnonzero(np.diff(log_cards)) + 1]
+        counts = np.diff(np.r_[starts, len(logs)])
+        steps = np.arange(len(logs)) - np.repeat(starts, counts)
+
+        n = len(reviewed)
+        eases = np.full(n, DEFAULT_EASE)
+        intervals = np.zeros(n, dtype=np.int64)
+        repetitions = np.zeros(n, dtype=np.int64)
+        due = np.empty(n, dtype='datetime64[us]')
+
+        for step in range(int(steps.max()) + 1):
+            selected = steps == step
+            idx = log_cards[selected]
+            eases[idx], intervals[idx], repetitions[idx], due[idx] = calculate_next_reviews(
+                log_ratings[selected], eases[idx], intervals[idx], repetitions[idx],
+                reviewed_at=log_times[selected]
+            )
+
+        due_dates = to_datetimes(due)
+        by_id = {card.id: card for card in cards}
+        changed = []
+        for i, card_id in enumerate(reviewed):
+            card = by_id[card_id]
+            card.sm2_ease = float(eases[i])
+            card.sm2_interval = int(intervals[i])
+            card.sm2_repetitions = int(repetitions[i])
+            card.next_review_at = due_dates[i]
+            changed.append(card)
+        return changed
@@ -1,22 +1,82 @@
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from apps.decks.models import Deck
 from apps.ingest.models import Source
 from apps.cards.models import Card
 
-class DeckSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Serializer that can be limited to a subset of its fields with fields=[...].
+    heavy_fields are the large columns list endpoints leave out unless asked for.
+    """
+    heavy_fields = ()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+def source_fields(serializer, fields=None):
+    """
+    Model attributes behind a serializer's readable fields (optionally only the named ones).
+    """
+    return [
+        field.source for name, field in serializer.fields.items()
+        if not field.write_only and field.source != '*' and (fields is None or name in fields)
+    ]
+
+class VisualURLField(serializers.ReadOnlyField):
+    """
+    Link to a visual payload on the visuals endpoint, from its hash.
+    """
+    def to_representation(self, visual_hash):
+        if not visual_hash:
+            return None
+        return reverse('visual-detail', args=[visual_hash], request=self.context.get('request'))
+
+class DeckSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Deck
         fields = '__all__'
-        read_only_fields = ('owner',)
+        read_only_fields = ('owner', 'fork_status', 'fork_copied', 'fork_total')
+
+class SourceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    heavy_fields = ('extracted_text',)
 
-class SourceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Source
         fields = '__all__'
-        read_only_fields = ('status', 'extracted_text', 'error_log')
+        read_only_fields = ('status', 'extracted_text', 'error_log', 'content_hash', 'etag', 'last_modified', 'fetched_at', 'page_ranges', 'original_bytes', 'upload_bytes', 'time_to_first_card')
+
+class CardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # Content fields read through to the shared CardContent row and are copied on write
+    front = serializers.CharField()
+    back = serializers.CharField()
+    hint = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    difficulty = serializers.ChoiceField(choices=Card.Difficulty.choices, required=False)
+    tags = serializers.JSONField(required=False)
+    # Visuals are written inline but read from the visuals endpoint
+    visual_payload = serializers.CharField(required=False, allow_blank=True, allow_null=True, write_only=True)
+    visual_url = VisualURLField(source='visual_hash')
 
-class CardSerializer(serializers.ModelSerializer):
     class Meta:
         model = Card
-        fields = '__all__'
-        read_only_fields = ('vector_id', 'sm2_ease', 'sm2_interval', 'sm2_repetitions', 'next_review_at')
+        exclude = ('content',)
+        read_only_fields = ('vector_id', 'content_hash', 'sm2_ease', 'sm2_interval', 'sm2_repetitions', 'next_review_at')
+
+# Fields the review UI renders; also used to limit the columns review queries load
+REVIEW_CARD_FIELDS = ('id', 'deck', 'front', 'back', 'hint', 'difficulty', 'tags', 'visual_url', 'next_review_at')
+
+class ReviewCardSerializer(serializers.ModelSerializer):
+    visual_url = VisualURLField(source='visual_hash')
+
+    class Meta:
+        model = Card
+        fields = REVIEW_CARD_FIELDS
+        read_only_fields = REVIEW_CARD_FIELDS
+
+class ReviewSubmissionSerializer(serializers.Serializer):
+    card_id = serializers.IntegerField()
+    rating = serializers.IntegerField(min_value=0, max_value=5)
+    reviewed_at = serializers.DateTimeField(required=False)
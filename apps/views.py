@@ -1,21 +1,83 @@
 from rest_framework import viewsets, status, decorators
 from rest_framework.response import Response
+from apps.conditional import ConditionalGetMixin, conditional_response, invalidate_cached_responses
 from apps.decks.models import Deck
+from apps.pagination import KeysetPagination
 from apps.ingest.models import Source
-from apps.cards.models import Card, ReviewLog
-from apps.serializers import DeckSerializer, SourceSerializer, CardSerializer
+from apps.cards.models import Card, ReviewLog, VisualPayload, card_only_fields
+from apps.serializers import (
+    DeckSerializer, SourceSerializer, CardSerializer, ReviewCardSerializer,
+    ReviewSubmissionSerializer, source_fields
+)
 from services.scheduler import calculate_next_review
+from services.forecast import forecast_reviews
 from services.ingest import fetch_url_content
-from services.llm import LLMService
-from services.vector import VectorService
+from services.llm import EmbeddingError, LLMService
+from services.vector import VectorService, get_vector_service
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
 from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
 import threading
+import zlib
 
 from rest_framework import viewsets, status, decorators, permissions
+from rest_framework.exceptions import ValidationError
 
-class DeckViewSet(viewsets.ModelViewSet):
+class SparseFieldsetMixin:
+    """
+    `fields=` query parameter (comma-separated) for list and retrieve responses.
+    Lists leave out the serializer's heavy_fields unless requested, and only the
+    columns behind the returned fields are read from the database.
+    """
+    sparse_actions = ('list', 'retrieve')
+
+    def get_response_fields(self):
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, '_response_fields'):
+            serializer_class = self.get_serializer_class()
+            available = [name for name, field in serializer_class().fields.items() if not field.write_only]
+            requested = self.request.query_params.get('fields')
+            if requested:
+                fields = [name.strip() for name in requested.split(',') if name.strip()]
+                unknown = sorted(set(fields) - set(available))
+                if unknown:
+                    raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}"})
+            elif self.action == 'list':
+                fields = [name for name in available if name not in serializer_class.heavy_fields]
+            else:
+                fields = None
+            self._response_fields = fields
+        return self._response_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_response_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def only_columns(self, queryset, sources):
+        model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+        # created_at is the pagination key, so it is always loaded
+        return queryset.only('created_at', *(source for source in sources if source in model_fields))
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_response_fields()
+        if fields is not None:
+            queryset = self.only_columns(queryset, source_fields(self.get_serializer_class()(), fields))
+        return queryset
+
+class DeckViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Deck.objects.all()
     serializer_class = DeckSerializer
+    pagination_class = KeysetPagination
+    cache_scope = 'decks'
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
@@ -36,59 +98,138 @@ class DeckViewSet(viewsets.ModelViewSet):
     def fork(self, request, pk=None):
         original_deck = self.get_object()
         
+        total = original_deck.cards.count()
+        run_in_background = total > settings.FORK_SYNC_MAX_CARDS
+        
         # 1. Create Fork
         forked_deck = Deck.objects.create(
             name=f"Fork of {original_deck.name}",
+            description=original_deck.description,
             owner=request.user,
-            parent_deck=original_deck
+            parent_deck=original_deck,
+            fork_status=Deck.ForkStatus.COPYING if run_in_background else Deck.ForkStatus.READY,
+            fork_total=total
         )
         
-        # 2. Copy Cards (Bulk Create)
-        original_cards = original_deck.cards.all()
-        new_cards = []
-        for card in original_cards:
-            new_cards.append(Card(
-                deck=forked_deck,
-                front=card.front,
-                back=card.back,
-                visual_payload=card.visual_payload,
-                # Clear vector_id as new cards might need fresh indexing if content changes, 
-                # but for exact copy we could copy it. Let's clear to be safe/independent.
-                vector_id=card.vector_id 
-            ))
-        
-        Card.objects.bulk_create(new_cards)
+        # 2. Copy cards in the database, chunk by chunk; they share the original content (copy on write)
+        from apps.decks.tasks import copy_deck_cards, fork_deck_cards
+        if run_in_background:
+            fork_deck_cards.delay(original_deck.id, forked_deck.id)
+            serializer = self.get_serializer(forked_deck)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
         
+        copy_deck_cards(original_deck.id, forked_deck.id)
+        forked_deck.refresh_from_db()
         serializer = self.get_serializer(forked_deck)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class SourceViewSet(viewsets.ModelViewSet):
+    @decorators.action(detail=True, methods=['get'])
+    def forecast(self, request, pk=None):
+        """
+        Forecast reviews due per day for this deck.
+        Query params: days (optional, 1-365, default 30)
+        """
+        deck = self.get_object()
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), 365)
+        except ValueError:
+            return Response({"error": "days must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Any card write changes the fingerprint, so cached forecasts never go stale
+        fingerprint = deck.cards.aggregate(count=Count('id'), last_update=Max('updated_at'))
+        last_update = fingerprint['last_update'].timestamp() if fingerprint['last_update'] else 0
+        cache_key = f"forecast:{deck.id}:{days}:{fingerprint['count']}:{last_update}:{timezone.localdate()}"
+        
+        result = cache.get(cache_key)
+        if result is None:
+            result = forecast_reviews(
+                deck.cards.all(),
+                ReviewLog.objects.filter(card__deck__owner_id=deck.owner_id),
+                days=days
+            )
+            cache.set(cache_key, result, timeout=settings.FORECAST_CACHE_TTL)
+        
+        return Response(result)
+
+class SourceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Source.objects.all()
     serializer_class = SourceSerializer
+    pagination_class = KeysetPagination
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         source = serializer.save(status=Source.Status.PROCESSING)
         
+        # Clients can pass use_cache=false to force fresh LLM generations
+        use_cache = str(request.data.get('use_cache', 'true')).lower() not in ('false', '0', 'no')
+        
         # Trigger async task
         from apps.ingest.tasks import process_source_url
-        process_source_url.delay(source.id)
+        process_source_url.delay(source.id, use_cache=use_cache)
         
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-class CardViewSet(viewsets.ModelViewSet):
-    queryset = Card.objects.all()
+class CardViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = Card.objects.select_related('content')
     serializer_class = CardSerializer
+    pagination_class = KeysetPagination
+    cache_scope = 'cards'
+    
+    def only_columns(self, queryset, sources):
+        columns = card_only_fields(sources)
+        if not any(column.startswith('content__') for column in columns):
+            # No content fields requested: skip the join entirely
+            queryset = queryset.select_related(None)
+        return queryset.only('created_at', *columns)
     
     def get_queryset(self):
-        qs = Card.objects.all()
+        qs = Card.objects.select_related('content')
         deck_id = self.request.query_params.get('deck', None)
         if deck_id:
             qs = qs.filter(deck_id=deck_id)
         return qs
 
+    @decorators.action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def search(self, request):
+        """
+        Semantic search over the user's cards.
+        Query params: q (required), deck (optional), limit (optional, max 50)
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+            deck_id = request.query_params.get('deck')
+            deck_id = int(deck_id) if deck_id else None
+        except ValueError:
+            return Response({"error": "deck and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Query embeddings are served from the embedding cache when repeated
+        try:
+            vector = LLMService().get_embedding(query, task_type="retrieval_query")
+        except (EmbeddingError, ValueError) as e:
+            # Searching with a placeholder vector would return arbitrary cards
+            print(f"[Search] Query embedding failed: {e}")
+            return Response({"error": "Search is temporarily unavailable"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        hits = get_vector_service().search(vector, limit=limit, deck_id=deck_id, owner_id=request.user.id)
+        
+        # Hydrate in one query, keeping Qdrant's ranking
+        cards = Card.objects.select_related('content').in_bulk([card_id for card_id, _ in hits])
+        results = []
+        for card_id, score in hits:
+            card = cards.get(card_id)
+            if card is None:
+                continue
+            data = CardSerializer(card, context={'request': request}).data
+            data['score'] = score
+            results.append(data)
+        
+        return Response({"query": query, "results": results})
+
 class ReviewViewSet(viewsets.ViewSet):
     @decorators.action(detail=False, methods=['get'])
     def next(self, request):
@@ -97,18 +238,51 @@ class ReviewViewSet(viewsets.ViewSet):
         Query params: deck (optional)
         """
         now = timezone.now()
-        qs = Card.objects.filter(next_review_at__lte=now).order_by('next_review_at')
+        qs = Card.objects.select_related('content').filter(next_review_at__lte=now).order_by('next_review_at')
         
         deck_id = request.query_params.get('deck')
         if deck_id:
             qs = qs.filter(deck_id=deck_id)
+        
+        def render():
+            card = qs.first()
+            if not card:
+                return Response({"message": "No cards due for review"}, status=status.HTTP_200_OK)
             
-        card = qs.first()
-        if not card:
-            return Response({"message": "No cards due for review"}, status=status.HTTP_200_OK)
-            
-        serializer = CardSerializer(card)
-        return Response(serializer.data)
+            serializer = CardSerializer(card, context={'request': request})
+            return Response(serializer.data)
+        
+        # The due set grows as time passes, so only ETags (never the response cache) apply here
+        return conditional_response(request, qs, render)
+
+    @decorators.action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def session(self, request):
+        """
+        Get the next N cards due for review in one query.
+        Query params: deck (optional, defaults to all of the user's decks), limit (optional, max 500)
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 500)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        qs = Card.objects.filter(next_review_at__lte=timezone.now(), deck__owner=request.user)
+        deck_id = request.query_params.get('deck')
+        if deck_id:
+            qs = qs.filter(deck_id=deck_id)
+        
+        def render():
+            cards = list(
+                qs.select_related('content')
+                .order_by('next_review_at')
+                .only(*card_only_fields(source_fields(ReviewCardSerializer())))[:limit]
+            )
+            return Response({
+                "count": len(cards),
+                "cards": ReviewCardSerializer(cards, many=True, context={'request': request}).data
+            })
+        
+        return conditional_response(request, qs, render)
 
     @decorators.action(detail=True, methods=['post'])
     def rate(self, request, pk=None):
@@ -139,9 +313,104 @@ class ReviewViewSet(viewsets.ViewSet):
         card.sm2_interval = new_interval
         card.sm2_repetitions = new_reps
         card.next_review_at = next_date
-        card.save()
+        card.save(update_fields=[*Card.SCHEDULE_FIELDS, 'updated_at'])
         
         return Response({
             "next_review_at": next_date,
             "interval_days": new_interval
         })
+
+    @decorators.action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        """
+        Submit many ratings at once, e.g. a whole offline session.
+        Body: {"reviews": [{"card_id": 1, "rating": 4, "reviewed_at": "..."}]}
+        Reviews are applied per card in reviewed_at order inside one transaction.
+        Only the user's own cards can be rated; other IDs are reported as not found.
+        """
+        serializer = ReviewSubmissionSerializer(data=request.data.get('reviews'), many=True)
+        serializer.is_valid(raise_exception=True)
+        reviews = serializer.validated_data
+        if not reviews:
+            return Response({"error": "No reviews submitted"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(reviews) > 1000:
+            return Response({"error": "At most 1000 reviews per request"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        now = timezone.now()
+        for review in reviews:
+            review.setdefault('reviewed_at', now)
+        # Stable sort keeps submission order for identical timestamps
+        reviews = sorted(reviews, key=lambda review: review['reviewed_at'])
+        card_ids = {review['card_id'] for review in reviews}
+        
+        with transaction.atomic():
+            cards = (
+                Card.objects.filter(deck__owner=request.user)
+                .select_for_update().only('id', *Card.SCHEDULE_FIELDS).in_bulk(card_ids)
+            )
+            missing = sorted(card_ids - set(cards))
+            if missing:
+                return Response({"error": "Cards not found", "card_ids": missing}, status=status.HTTP_404_NOT_FOUND)
+            
+            logs = []
+            for review in reviews:
+                card = cards[review['card_id']]
+                card.sm2_ease, card.sm2_interval, card.sm2_repetitions, card.next_review_at = calculate_next_review(
+                    review['rating'],
+                    card.sm2_ease,
+                    card.sm2_interval,
+                    card.sm2_repetitions,
+                    reviewed_at=review['reviewed_at']
+                )
+                logs.append(ReviewLog(card=card, rating=review['rating'], reviewed_at=review['reviewed_at']))
+            
+            for card in cards.values():
+                card.updated_at = now
+            ReviewLog.objects.bulk_create(logs)
+            Card.objects.bulk_update(cards.values(), [*Card.SCHEDULE_FIELDS, 'updated_at'])
+            invalidate_cached_responses('cards')
+        
+        return Response({
+            "reviewed": len(logs),
+            "cards": [
+                {
+                    "card_id": card.id,
+                    "next_review_at": card.next_review_at,
+                    "interval_days": card.sm2_interval
+                }
+                for card in cards.values()
+            ]
+        })
+
+def accepts_deflate(request):
+    for coding in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = coding.partition(';')
+        if name.strip() == 'deflate':
+            return params.replace(' ', '') not in ('q=0', 'q=0.0')
+    return False
+
+@require_GET
+@cache_control(public=True, max_age=settings.VISUAL_CACHE_MAX_AGE, immutable=True)
+@condition(etag_func=lambda request, visual_hash: visual_hash)
+def visual_payload(request, visual_hash):
+    """
+    Serves a card's visual payload by hash. Payloads are content-addressed, so a response never
+    changes and browsers and shared caches may keep it for good. No auth, so <img> tags and CDNs
+    can fetch it; the hash is only known to holders of the card.
+    """
+    try:
+        payload = VisualPayload.objects.get(hash=visual_hash)
+    except VisualPayload.DoesNotExist:
+        raise Http404("Visual not found")
+
+    # Stored bytes are zlib streams, which is HTTP's deflate coding: pass them through when accepted
+    if accepts_deflate(request):
+        response = HttpResponse(bytes(payload.data), content_type=payload.media_type)
+        response['Content-Encoding'] = 'deflate'
+    else:
+        response = HttpResponse(zlib.decompress(payload.data), content_type=payload.media_type)
+    response['Vary'] = 'Accept-Encoding'
+    # SVG opened directly must not run scripts on the API origin
+    response['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'"
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
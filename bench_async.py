@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Load-test the sync (WSGI) and async (ASGI) review/search endpoints at equal worker counts.
+
+Needs gunicorn and httpx on top of the app requirements: pip install -r requirements-bench.txt
+
+Start both deployments against the same database, Redis and Qdrant, e.g. with 4 workers each:
+
+    gunicorn config.wsgi -w 4 -b 127.0.0.1:8001
+    uvicorn config.asgi:application --workers 4 --port 8002
+
+Usage: python bench_async.py --username U --password P [--wsgi URL] [--asgi URL]
+                             [--concurrency N] [--duration S] [--endpoints session,rate,search]
+
+The WSGI target is driven through the DRF endpoints (/api/v1/review/...), the ASGI target
+through /api/v1/async/.... "rate" writes real reviews for the user's due cards.
+Reports throughput and latency percentiles per endpoint and deployment.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+import httpx
+
+SYNC_PATHS = {
+    'session': '/api/v1/review/session/?limit=50',
+    'rate': '/api/v1/review/{card_id}/rate/',
+    'search': '/api/v1/cards/search/?q={query}',
+}
+ASYNC_PATHS = {
+    'session': '/api/v1/async/review/session/?limit=50',
+    'rate': '/api/v1/async/review/{card_id}/rate/',
+    'search': '/api/v1/async/cards/search/?q={query}',
+}
+QUERIES = ['mitochondria', 'photosynthesis', 'cell membrane', 'ATP synthesis', 'enzymes']
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def get_token(base_url, username, password):
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.post('/auth/jwt/create/', json={'username': username, 'password': password})
+        response.raise_for_status()
+        return response.json()['access']
+
+
+async def due_card_ids(client, path):
+    response = await client.get(path)
+    response.raise_for_status()
+    return [card['id'] for card in response.json()['cards']]
+
+
+async def run_endpoint(base_url, token, paths, endpoint, concurrency, duration):
+    headers = {'Authorization': f'Bearer {token}'}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        card_ids = itertools.cycle(await due_card_ids(client, paths['session']) or [0])
+        queries = itertools.cycle(QUERIES)
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def request():
+            if endpoint == 'rate':
+                return await client.post(paths['rate'].format(card_id=next(card_ids)), json={'rating': 4})
+            return await client.get(paths[endpoint].format(query=next(queries)))
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await request()
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wsgi', default='http://127.0.0.1:8001')
+    parser.add_argument('--asgi', default='http://127.0.0.1:8002')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--endpoints', default='session,rate,search')
+    args = parser.parse_args()
+
+    token = await get_token(args.wsgi, args.username, args.password)
+    print(f"⚡ {args.concurrency} concurrent clients, {args.duration:.0f}s per run\n")
+    print(f"{'endpoint':<10} {'server':<6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+
+    for endpoint in args.endpoints.split(','):
+        for server, base_url, paths in (('wsgi', args.wsgi, SYNC_PATHS), ('asgi', args.asgi, ASYNC_PATHS)):
+            latencies, errors = await run_endpoint(
+                base_url, token, paths, endpoint, args.concurrency, args.duration
+            )
+            print(
+                f"{endpoint:<10} {server:<6} {len(latencies) / args.duration:>9.1f} "
+                f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} "
+                f"{percentile(latencies, 99):>9.1f} {errors:>7}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
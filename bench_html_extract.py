@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML-to-text extractors over a corpus of saved pages.
+
+Usage: python bench_html_extract.py [corpus_dir] [--repeat N]
+
+corpus_dir holds saved .html/.htm files (default: testing_html/). Reports throughput per
+extractor and output parity against the original BeautifulSoup extractor, after checking
+that every extractor decodes non-ASCII pages correctly.
+"""
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.html_extract import EXTRACTORS, lxml_available
+from services.ingest import header_charset
+
+
+def line_overlap(reference: str, candidate: str) -> float:
+    """
+    Jaccard overlap of the two outputs' line sets (1.0 = same lines).
+    """
+    ref_lines, cand_lines = set(reference.splitlines()), set(candidate.splitlines())
+    if not ref_lines and not cand_lines:
+        return 1.0
+    return len(ref_lines & cand_lines) / len(ref_lines | cand_lines)
+
+
+# (body, Content-Type header): the charset is declared only in the header, only in <meta>, or not at all
+ENCODING_TEXT = "Café naïve — 東京"
+ENCODING_CASES = [
+    (f"<html><body><p>{ENCODING_TEXT}</p></body></html>".encode('utf-8'), 'text/html; charset=utf-8'),
+    (f"<html><body><p>{ENCODING_TEXT}</p></body></html>".encode('utf-8'), 'text/html'),
+    (f'<html><head><meta charset="utf-8"></head><body><p>{ENCODING_TEXT}</p></body></html>'.encode('utf-8'), 'text/html'),
+    ("<html><body><p>Café naïve</p></body></html>".encode('cp1252'), 'text/html; charset=windows-1252'),
+]
+
+
+def check_encodings(names) -> bool:
+    """
+    Every extractor must decode the same non-ASCII text regardless of where the charset is declared.
+    """
+    ok = True
+    for body, content_type in ENCODING_CASES:
+        encoding = header_charset(content_type)
+        expected = ENCODING_TEXT if encoding != 'windows-1252' else "Café naïve"
+        for name in names:
+            text = EXTRACTORS[name]().extract(body, encoding=encoding)
+            if text != expected:
+                ok = False
+                print(f"❌ {name} decoded {text!r} ({content_type!r}), expected {expected!r}")
+    print("✅ Encoding checks passed\n" if ok else "")
+    return ok
+
+
+def run_benchmark(corpus_dir: Path, repeat: int):
+    names = [name for name in EXTRACTORS if name != 'lxml' or lxml_available()]
+    if not check_encodings(names):
+        sys.exit(1)
+
+    pages = sorted(p for p in corpus_dir.rglob('*') if p.suffix.lower() in ('.html', '.htm'))
+    if not pages:
+        print(f"❌ No .html files found in {corpus_dir}")
+        return
+
+    documents = [p.read_bytes() for p in pages]
+    total_mb = sum(len(d) for d in documents) / (1024 * 1024)
+    print(f"📄 {len(pages)} pages, {total_mb:.1f} MB, {repeat} repeats\n")
+
+    outputs = {}
+    for name in names:
+        extractor = EXTRACTORS[name]()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [extractor.extract(doc) for doc in documents]
+        elapsed = (time.perf_counter() - start) / repeat
+        outputs[name] = results
+        print(f"{name:<10} {elapsed * 1000:8.1f} ms/corpus  {total_mb / elapsed:7.1f} MB/s")
+
+    print("\nParity vs soup:")
+    reference = outputs['soup']
+    for name in names:
+        if name == 'soup':
+            continue
+        exact = sum(a == b for a, b in zip(reference, outputs[name]))
+        overlap = sum(line_overlap(a, b) for a, b in zip(reference, outputs[name])) / len(pages)
+        print(f"{name:<10} exact {exact}/{len(pages)}  mean line overlap {overlap:.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('corpus_dir', nargs='?', default='testing_html')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(Path(args.corpus_dir), args.repeat)
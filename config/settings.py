@@ -178,6 +178,86 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Gemini File API uploads, reused by content hash until shortly before Gemini expires them (48h)
+GEMINI_UPLOAD_REUSE_MARGIN = 60 * 60  # stop reusing an upload an hour before it expires
+GEMINI_UPLOAD_WORKERS = 4  # concurrent uploads per job
+GEMINI_UPLOAD_PROCESSING_TIMEOUT = 120  # seconds to wait for Gemini to process a PDF
+CELERY_BEAT_SCHEDULE = {
+    'gc-gemini-uploads': {
+        'task': 'apps.ingest.tasks.gc_gemini_uploads',
+        'schedule': 60 * 60 * 6,  # seconds
+    },
+}
+
+# Ingest progress events, published over Redis pub/sub and streamed to clients as SSE
+EVENTS_REDIS_URL = 'redis://localhost:6379/0'  # pub/sub channels are shared across databases
+SSE_HEARTBEAT_SECONDS = 15  # keep-alive comment interval on idle streams
+
+# URL fetching
+FETCH_TIMEOUT = 10  # seconds
+FETCH_MAX_BYTES = 10 * 1024 * 1024
+FETCH_POOL_HOSTS = 20
+FETCH_POOL_MAXSIZE_PER_HOST = 4
+# A URL ingested this recently is reused without any network request
+FETCH_FRESHNESS_SECONDS = 600
+# HTML-to-text backend: 'auto' (lxml if installed, else streaming), 'lxml', 'streaming' or 'soup'
+HTML_EXTRACTOR = 'auto'
+
+# Card generation: sources longer than this are split into chunks generated in parallel
+GENERATION_CHUNK_CHARS = 12000
+# Streamed generation: cards are saved as they arrive, but announced and embedded in batches
+GENERATION_STREAM_BATCH_CARDS = 10
+GENERATION_STREAM_BATCH_SECONDS = 3
+# Vision generation: PDFs longer than this many pages are split into page ranges generated in parallel
+PDF_PAGES_PER_RANGE = 10
+# PDF pages with fewer extractable letters/digits than this (scans, diagrams) are sent to vision
+PDF_TEXT_MIN_CHARS = 200
+# Image uploads are downscaled to fit this box before vision calls (Gemini scales larger images down anyway)
+VISION_IMAGE_MAX_SIDE = 3072
+# JPEG quality used when recompressing photos
+VISION_IMAGE_QUALITY = 85
+# Convert uploaded images to grayscale (saves bytes on document scans and whiteboards)
+VISION_IMAGE_GRAYSCALE = os.environ.get('VISION_IMAGE_GRAYSCALE', 'False').lower() == 'true'
+
+# Deck forks: cards are copied in chunks; decks larger than FORK_SYNC_MAX_CARDS are forked by a Celery task
+FORK_CHUNK_SIZE = 5000
+FORK_SYNC_MAX_CARDS = 2000
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/2',
+    }
+}
+
+# Embedding cache (in-process LRU in front of the Redis cache above)
+EMBEDDING_CACHE_ALIAS = 'default'
+EMBEDDING_CACHE_TTL = 60 * 60 * 24 * 30  # 30 days
+EMBEDDING_CACHE_LOCAL_SIZE = 10000
+
+# Visual payloads are content-addressed and immutable, so clients may cache them for a year
+VISUAL_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Rendered API responses (deck/card list and detail) cached in Redis until a write to their
+# models; 0 disables the cache. ETags / 304s apply either way.
+API_RESPONSE_CACHE_TTL = 60 * 5
+
+# Review workload forecasts (also invalidated by any card change)
+FORECAST_CACHE_TTL = 60 * 60 * 6  # 6 hours
+
+# YouTube transcript + metadata cache, keyed by video ID
+YOUTUBE_CACHE_TTL = 60 * 60 * 24 * 7  # 7 days
+YOUTUBE_CACHE_MISS_TTL = 60 * 60  # retry missing transcripts after an hour
+
+# LLM response cache. BACKEND is 'redis', 'file' (local directory, for tests) or None to disable.
+LLM_RESPONSE_CACHE = {
+    'BACKEND': 'redis',
+    'LOCATION': 'redis://localhost:6379/3',
+    'TTL': 60 * 60 * 24 * 7,  # 7 days
+    'MAX_ENTRIES': 50000,
+}
+
 # Qdrant
 QDRANT_HOST = 'localhost'
 QDRANT_PORT = 6333
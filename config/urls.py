@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from apps.views import DeckViewSet, SourceViewSet, CardViewSet, ReviewViewSet
+from apps.views import DeckViewSet, SourceViewSet, CardViewSet, ReviewViewSet, visual_payload
+from apps import async_views
 
 router = DefaultRouter()
 router.register(r'decks', DeckViewSet, basename='deck')
@@ -14,6 +15,12 @@ from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/v1/visuals/<str:visual_hash>/', visual_payload, name='visual-detail'),
+    # Async variants of the hot paths; only non-blocking when served over ASGI (config.asgi)
+    path('api/v1/async/review/session/', async_views.review_session, name='async-review-session'),
+    path('api/v1/async/review/<int:card_id>/rate/', async_views.review_rate, name='async-review-rate'),
+    path('api/v1/async/cards/search/', async_views.card_search, name='async-card-search'),
+    path('api/v1/async/sources/<int:source_id>/events/', async_views.source_events, name='async-source-events'),
     path('api/v1/', include(router.urls)),
     path('auth/', include('djoser.urls')),
     path('auth/', include('djoser.urls.jwt')),
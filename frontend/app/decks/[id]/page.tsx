@@ -1,11 +1,11 @@
 // file: /app/decks/[id]/page.tsx
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import Link from 'next/link';
 import { motion, AnimatePresence } from 'framer-motion';
-import api from '@/utils/axios';
+import api, { fetchPage, subscribeSourceEvents, SourceEvent } from '@/utils/axios';
 import Button from '@/components/ui/Button';
 import GlassCard from '@/components/ui/GlassCard';
 import Input from '@/components/ui/Input';
@@ -44,6 +44,9 @@ interface Card {
     next_review_at?: string;
 }
 
+// Columns the card list renders
+const CARD_LIST_FIELDS = 'id,front,back,hint,difficulty,tags,next_review_at';
+
 interface Source {
     id: number;
     url: string;
@@ -64,6 +67,8 @@ export default function DeckDetailPage() {
 
     const [deck, setDeck] = useState<Deck | null>(null);
     const [cards, setCards] = useState<Card[]>([]);
+    const [nextCardsPage, setNextCardsPage] = useState<string | null>(null);
+    const [loadingMoreCards, setLoadingMoreCards] = useState(false);
     const [sources, setSources] = useState<Source[]>([]);
     const [loading, setLoading] = useState(true);
     const [url, setUrl] = useState('');
@@ -71,16 +76,21 @@ export default function DeckDetailPage() {
     const [ingestError, setIngestError] = useState('');
     const [expandedCard, setExpandedCard] = useState<number | null>(null);
     const [filterDifficulty, setFilterDifficulty] = useState<string | null>(null);
+    const closeStreams = useRef<(() => void)[]>([]);
+
+    // Close ingest event streams when leaving the page
+    useEffect(() => () => closeStreams.current.forEach(close => close()), []);
 
     useEffect(() => {
         async function loadData() {
             try {
-                const [deckRes, cardsRes] = await Promise.all([
+                const [deckRes, cardsPage] = await Promise.all([
                     api.get(`/api/v1/decks/${deckId}/`),
-                    api.get(`/api/v1/cards/?deck=${deckId}`)
+                    fetchPage<Card>(`/api/v1/cards/?deck=${deckId}&fields=${CARD_LIST_FIELDS}`)
                 ]);
                 setDeck(deckRes.data);
-                setCards(cardsRes.data);
+                setCards(cardsPage.results);
+                setNextCardsPage(cardsPage.next);
             } catch (err) {
                 console.error('Failed to load deck', err);
             } finally {
@@ -104,7 +114,7 @@ export default function DeckDetailPage() {
             });
             setSources(prev => [res.data, ...prev]);
             setUrl('');
-            pollSourceStatus(res.data.id);
+            watchSource(res.data.id);
         } catch (err: any) {
             console.error(err);
             setIngestError('Failed to process URL. Please try again.');
@@ -113,23 +123,57 @@ export default function DeckDetailPage() {
         }
     }
 
-    async function pollSourceStatus(sourceId: number) {
-        const interval = setInterval(async () => {
-            try {
-                const res = await api.get(`/api/v1/ingest/${sourceId}/`);
-                setSources(prev => prev.map(s => s.id === sourceId ? res.data : s));
-
-                if (res.data.status === 'COMPLETED' || res.data.status === 'FAILED') {
-                    clearInterval(interval);
-                    if (res.data.status === 'COMPLETED') {
-                        const cardsRes = await api.get(`/api/v1/cards/?deck=${deckId}`);
-                        setCards(cardsRes.data);
-                    }
-                }
-            } catch (err) {
-                clearInterval(interval);
+    // Follow a source's ingest progress; cards arrive with the events as soon as they are generated
+    function watchSource(sourceId: number) {
+        const close = subscribeSourceEvents(sourceId, (event: SourceEvent) => {
+            if (event.status) {
+                setSources(prev => prev.map(s => s.id === sourceId ? { ...s, status: event.status! } : s));
+            }
+            if (event.stage === 'cards_created' && event.cards) {
+                const created = event.cards as unknown as Card[];
+                setCards(prev => {
+                    const known = new Set(prev.map(card => card.id));
+                    return [...prev, ...created.filter(card => !known.has(card.id))];
+                });
+            }
+            if (event.stage === 'generated' && event.removed_card_ids?.length) {
+                setCards(prev => prev.filter(card => !event.removed_card_ids!.includes(card.id)));
             }
-        }, 2000);
+            // Generation is over; later events (embedding) don't change the page
+            if (event.stage === 'generated' || event.stage === 'failed' || event.status === 'FAILED') {
+                close();
+            }
+        }, () => reloadSource(sourceId));
+        closeStreams.current.push(close);
+    }
+
+    // Fallback when the event stream is unavailable: fetch the source status and first page of cards once
+    async function reloadSource(sourceId: number) {
+        try {
+            const [sourceRes, cardsPage] = await Promise.all([
+                api.get<Source>(`/api/v1/ingest/${sourceId}/?fields=id,status`),
+                fetchPage<Card>(`/api/v1/cards/?deck=${deckId}&fields=${CARD_LIST_FIELDS}`)
+            ]);
+            setSources(prev => prev.map(s => s.id === sourceId ? { ...s, status: sourceRes.data.status } : s));
+            setCards(cardsPage.results);
+            setNextCardsPage(cardsPage.next);
+        } catch (err) {
+            console.error('Failed to reload source', err);
+        }
+    }
+
+    async function loadMoreCards() {
+        if (!nextCardsPage) return;
+        setLoadingMoreCards(true);
+        try {
+            const page = await fetchPage<Card>(nextCardsPage);
+            setCards(prev => [...prev, ...page.results]);
+            setNextCardsPage(page.next);
+        } catch (err) {
+            console.error('Failed to fetch cards', err);
+        } finally {
+            setLoadingMoreCards(false);
+        }
     }
 
     async function handleDeleteDeck() {
@@ -230,7 +274,7 @@ export default function DeckDetailPage() {
             {/* Stats */}
             <div className="grid grid-cols-2 lg:grid-cols-4 gap-4">
                 <div className="p-4 rounded-xl bg-[var(--glass-bg)] border border-[var(--glass-border)]">
-                    <p className="text-2xl font-bold text-[var(--accent)]">{cards.length}</p>
+                    <p className="text-2xl font-bold text-[var(--accent)]">{cards.length}{nextCardsPage ? '+' : ''}</p>
                     <p className="text-sm text-[var(--text-secondary)]">Total Cards</p>
                 </div>
                 <div className="p-4 rounded-xl bg-[var(--glass-bg)] border border-[var(--glass-border)]">
@@ -449,6 +493,14 @@ export default function DeckDetailPage() {
                         })}
                     </div>
                 )}
+
+                {nextCardsPage && (
+                    <div className="flex justify-center">
+                        <Button variant="ghost" onClick={loadMoreCards} disabled={loadingMoreCards}>
+                            {loadingMoreCards ? 'Loading...' : 'Load more cards'}
+                        </Button>
+                    </div>
+                )}
             </div>
         </div>
     );
@@ -5,7 +5,7 @@ import { useEffect, useState } from 'react';
 import Link from 'next/link';
 import { useRouter } from 'next/navigation';
 import { useAuth } from '@/context/AuthContext';
-import api from '@/utils/axios';
+import api, { fetchPage } from '@/utils/axios';
 import Button from '@/components/ui/Button';
 import GlassCard from '@/components/ui/GlassCard';
 import CreateDeckModal from '@/components/CreateDeckModal';
@@ -30,6 +30,8 @@ export default function MyDecksPage() {
     const { user, loading: authLoading } = useAuth();
     const router = useRouter();
     const [decks, setDecks] = useState<Deck[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [searchQuery, setSearchQuery] = useState('');
     const [isCreateModalOpen, setIsCreateModalOpen] = useState(false);
@@ -41,9 +43,10 @@ export default function MyDecksPage() {
         }
 
         if (user) {
-            api.get('/api/v1/decks/')
-                .then(res => {
-                    setDecks(res.data);
+            fetchPage<Deck>('/api/v1/decks/')
+                .then(page => {
+                    setDecks(page.results);
+                    setNextPage(page.next);
                     setLoading(false);
                 })
                 .catch(err => {
@@ -53,6 +56,20 @@ export default function MyDecksPage() {
         }
     }, [user, authLoading, router]);
 
+    async function loadMoreDecks() {
+        if (!nextPage) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage<Deck>(nextPage);
+            setDecks(prev => [...prev, ...page.results]);
+            setNextPage(page.next);
+        } catch (err) {
+            console.error('Failed to fetch decks', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    }
+
     const handleDeckCreated = (newDeck: Deck) => {
         setDecks(prev => [...prev, newDeck]);
     };
@@ -83,7 +100,7 @@ export default function MyDecksPage() {
                     </Link>
                     <h1 className="text-3xl font-bold">My Decks</h1>
                     <p className="text-[var(--text-secondary)]">
-                        {decks.length} deck{decks.length !== 1 ? 's' : ''} in your collection
+                        {decks.length}{nextPage ? '+' : ''} deck{decks.length !== 1 ? 's' : ''} in your collection
                     </p>
                 </div>
                 <Button
@@ -192,6 +209,14 @@ export default function MyDecksPage() {
                 </div>
             )}
 
+            {nextPage && (
+                <div className="flex justify-center">
+                    <Button variant="ghost" onClick={loadMoreDecks} disabled={loadingMore}>
+                        {loadingMore ? 'Loading...' : 'Load more decks'}
+                    </Button>
+                </div>
+            )}
+
             {/* Create Deck Modal */}
             <CreateDeckModal
                 isOpen={isCreateModalOpen}
@@ -6,7 +6,7 @@ import Link from 'next/link';
 import Image from 'next/image';
 import { motion } from 'framer-motion';
 import { useAuth } from '@/context/AuthContext';
-import api from '@/utils/axios';
+import { fetchPage } from '@/utils/axios';
 import Button from "@/components/ui/Button";
 import GlassCard from "@/components/ui/GlassCard";
 import CreateDeckModal from "@/components/CreateDeckModal";
@@ -39,12 +39,16 @@ interface Deck {
 export default function Home() {
   const { user, loading } = useAuth();
   const [decks, setDecks] = useState<Deck[]>([]);
+  const [hasMoreDecks, setHasMoreDecks] = useState(false);
   const [isCreateModalOpen, setIsCreateModalOpen] = useState(false);
 
   useEffect(() => {
     if (user) {
-      api.get('/api/v1/decks/')
-        .then(res => setDecks(res.data))
+      fetchPage<Deck>('/api/v1/decks/')
+        .then(page => {
+          setDecks(page.results);
+          setHasMoreDecks(page.next !== null);
+        })
         .catch(err => console.error("Failed to fetch decks", err));
     }
   }, [user]);
@@ -254,7 +258,7 @@ export default function Home() {
             Your progress
           </h2>
           <div className="grid grid-cols-2 lg:grid-cols-4 gap-3">
-            <StatCard value={decks.length} label="Decks" />
+            <StatCard value={hasMoreDecks ? `${decks.length}+` : decks.length} label="Decks" />
             <StatCard value="12" label="Due today" highlight />
             <StatCard value="5" label="Day streak" />
             <StatCard value="2.3h" label="Study time" />
@@ -27,7 +27,7 @@ interface Card {
     hint?: string;
     difficulty?: 'basic' | 'intermediate' | 'advanced';
     tags?: string[];
-    visual_payload?: string;
+    visual_url?: string | null;
 }
 
 interface RatingOption {
@@ -329,12 +329,12 @@ export default function ReviewPage() {
                                             {card?.back}
                                         </p>
 
-                                        {/* Visual Payload (SVG) */}
-                                        {card?.visual_payload && (
-                                            <div
-                                                className="mt-6 p-4 rounded-xl bg-white/5"
-                                                dangerouslySetInnerHTML={{ __html: card.visual_payload }}
-                                            />
+                                        {/* Visual Payload (SVG), fetched and cached separately from the card */}
+                                        {card?.visual_url && (
+                                            <div className="mt-6 p-4 rounded-xl bg-white/5">
+                                                {/* eslint-disable-next-line @next/next/no-img-element */}
+                                                <img src={card.visual_url} alt="" className="mx-auto max-w-full" />
+                                            </div>
                                         )}
                                     </GlassCard>
                                 </motion.div>
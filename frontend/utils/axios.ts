@@ -22,6 +22,30 @@ api.interceptors.request.use(
     }
 );
 
+// Exchanges the refresh token for a new access token; null (and logged out) when that fails
+export async function refreshAccessToken(): Promise<string | null> {
+    try {
+        const refreshToken = Cookies.get('refreshToken');
+        if (refreshToken) {
+            const res = await axios.post(`${api.defaults.baseURL}/auth/jwt/refresh/`, {
+                refresh: refreshToken
+            });
+
+            if (res.data.access) {
+                Cookies.set('accessToken', res.data.access);
+                return res.data.access;
+            }
+        }
+    } catch (refreshError) {
+        // Refresh failed
+        Cookies.remove('accessToken');
+        Cookies.remove('refreshToken');
+        // Optional: redirect to login
+        // window.location.href = '/login';
+    }
+    return null;
+}
+
 // Response interceptor to handle token refresh
 api.interceptors.response.use(
     (response) => response,
@@ -32,32 +56,111 @@ api.interceptors.response.use(
         if (error.response?.status === 401 && !originalRequest._retry) {
             originalRequest._retry = true;
 
-            try {
-                const refreshToken = Cookies.get('refreshToken');
-                if (refreshToken) {
-                    // Try to refresh the token
-                    const res = await axios.post(`${api.defaults.baseURL}/auth/jwt/refresh/`, {
-                        refresh: refreshToken
-                    });
-
-                    if (res.data.access) {
-                        Cookies.set('accessToken', res.data.access);
-                        
-                        // Retry the original request with new token
-                        originalRequest.headers.Authorization = `Bearer ${res.data.access}`;
-                        return api(originalRequest);
-                    }
-                }
-            } catch (refreshError) {
-                // Refresh failed
-                Cookies.remove('accessToken');
-                Cookies.remove('refreshToken');
-                // Optional: redirect to login
-                // window.location.href = '/login';
+            const access = await refreshAccessToken();
+            if (access) {
+                // Retry the original request with new token
+                originalRequest.headers.Authorization = `Bearer ${access}`;
+                return api(originalRequest);
             }
         }
         return Promise.reject(error);
     }
 );
 
+export interface Page<T> {
+    next: string | null;
+    results: T[];
+}
+
+// List endpoints are keyset-paginated; fetch one page and follow `next` only when more is needed
+export async function fetchPage<T>(url: string): Promise<Page<T>> {
+    const res = await api.get<Page<T>>(url);
+    return res.data;
+}
+
+export interface SourceEvent {
+    source: number;
+    stage: 'status' | 'fetched' | 'generating' | 'cards_created' | 'page_range' | 'generated' | 'embedded' | 'failed';
+    status?: 'PENDING' | 'PROCESSING' | 'COMPLETED' | 'FAILED';
+    card_ids?: number[];
+    // cards_created: the new cards' list fields
+    cards?: { id: number; [field: string]: unknown }[];
+    removed_card_ids?: number[];
+    [key: string]: unknown;
+}
+
+// Reconnect attempts after a dropped event stream before falling back to onGiveUp
+const SOURCE_EVENTS_MAX_RETRIES = 3;
+
+// Ingest progress is pushed as Server-Sent Events. EventSource cannot send the Authorization
+// header, so the stream is read with fetch. A 401 refreshes the access token once; a dropped
+// stream is reopened up to SOURCE_EVENTS_MAX_RETRIES times with backoff. When the stream cannot
+// be (re)opened, onGiveUp is called so the caller can fall back to polling the API.
+// Returns a function that closes the stream.
+export function subscribeSourceEvents(
+    sourceId: number,
+    onEvent: (event: SourceEvent) => void,
+    onGiveUp?: () => void
+): () => void {
+    const controller = new AbortController();
+
+    async function readStream(): Promise<'unauthorized' | 'failed' | 'dropped'> {
+        const res = await fetch(`${api.defaults.baseURL}/api/v1/async/sources/${sourceId}/events/`, {
+            headers: {
+                Accept: 'text/event-stream',
+                Authorization: `Bearer ${Cookies.get('accessToken')}`,
+            },
+            signal: controller.signal,
+        });
+        if (res.status === 401) return 'unauthorized';
+        if (!res.ok || !res.body) return 'failed';
+
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) return 'dropped';
+            buffer += value;
+            let end;
+            while ((end = buffer.indexOf('\n\n')) !== -1) {
+                const message = buffer.slice(0, end);
+                buffer = buffer.slice(end + 2);
+                const data = message
+                    .split('\n')
+                    .filter(line => line.startsWith('data:'))
+                    .map(line => line.slice(5).trim())
+                    .join('\n');
+                if (data) onEvent(JSON.parse(data));
+            }
+        }
+    }
+
+    (async () => {
+        let refreshed = false;
+        let retries = 0;
+        while (!controller.signal.aborted) {
+            let outcome;
+            try {
+                outcome = await readStream();
+            } catch (err: any) {
+                if (err.name === 'AbortError') return;
+                console.error('Source event stream failed', err);
+                outcome = 'dropped';
+            }
+            if (controller.signal.aborted) return;
+
+            if (outcome === 'unauthorized' && !refreshed && await refreshAccessToken()) {
+                refreshed = true;
+                continue;
+            }
+            if (outcome !== 'dropped' || retries >= SOURCE_EVENTS_MAX_RETRIES) break;
+            retries += 1;
+            await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** retries));
+        }
+        if (!controller.signal.aborted) onGiveUp?.();
+    })();
+
+    return () => controller.abort();
+}
+
 export default api;
@@ -0,0 +1,58 @@
+import re
+from typing import List
+
+HEADING_RE = re.compile(r'^\s*(#{1,6}\s+\S|(chapter|section|part|unit)\s+[\dIVXivx]+\b)', re.IGNORECASE)
+BLANK_LINE_RE = re.compile(r'\n\s*\n')
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_oversized(block: str, max_chars: int) -> List[str]:
+    """
+    Splits a block longer than max_chars on lines, then sentences, then hard cuts.
+    """
+    for pattern in ('\n', SENTENCE_RE):
+        parts = block.split(pattern) if isinstance(pattern, str) else pattern.split(block)
+        if len(parts) > 1:
+            pieces = []
+            for part in parts:
+                if len(part) > max_chars:
+                    pieces.extend(_split_oversized(part, max_chars))
+                elif part.strip():
+                    pieces.append(part)
+            return pieces
+    return [block[i:i + max_chars] for i in range(0, len(block), max_chars)]
+
+
+def chunk_text(text: str, max_chars: int = 12000) -> List[str]:
+    """
+    Splits text into chunks of at most max_chars, preferring section and paragraph boundaries.
+    A heading starts a new chunk once the current chunk is at least half full.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    blocks = []
+    for paragraph in BLANK_LINE_RE.split(text):
+        # Extracted web text has no blank lines, so lines double as paragraphs
+        for line_block in (paragraph.split('\n') if len(paragraph) > max_chars else [paragraph]):
+            if len(line_block) > max_chars:
+                blocks.extend(_split_oversized(line_block, max_chars))
+            elif line_block.strip():
+                blocks.append(line_block)
+
+    chunks = []
+    current = []
+    current_len = 0
+    for block in blocks:
+        starts_section = bool(HEADING_RE.match(block))
+        too_long = current_len + len(block) + 1 > max_chars
+        if current and (too_long or (starts_section and current_len >= max_chars // 2)):
+            chunks.append('\n'.join(current))
+            current, current_len = [], 0
+        current.append(block)
+        current_len += len(block) + 1
+
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
@@ -0,0 +1,116 @@
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes text so that trivially different inputs share a cache entry.
+    """
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+def embedding_key(text: str, model: str, task_type: str) -> str:
+    """
+    Content-addressed key for an embedding: hash of (model, task type, normalized text).
+    """
+    digest = hashlib.sha256(f"{model}\0{task_type}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+    return f"emb:{digest}"
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of the shared Redis cache.
+    """
+
+    def __init__(self, max_local: Optional[int] = None, ttl: Optional[int] = None):
+        self.max_local = max_local or settings.EMBEDDING_CACHE_LOCAL_SIZE
+        self.ttl = ttl or settings.EMBEDDING_CACHE_TTL
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def remote(self):
+        return caches[settings.EMBEDDING_CACHE_ALIAS]
+
+    def _get_local(self, key: str):
+        with self._lock:
+            vector = self._local.get(key)
+            if vector is not None:
+                self._local.move_to_end(key)
+            return vector
+
+    def _set_local(self, key: str, vector: list):
+        with self._lock:
+            self._local[key] = vector
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local:
+                self._local.popitem(last=False)
+
+    def get_many(self, keys: List[str]) -> Dict[str, list]:
+        """
+        Returns {key: vector} for every key found in either tier.
+        Remote hits are promoted into the local LRU.
+        """
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self._get_local(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing.append(key)
+
+        if missing:
+            try:
+                remote_found = self.remote.get_many(missing)
+            except Exception as e:
+                print(f"[EmbeddingCache] Remote lookup failed: {e}")
+                remote_found = {}
+            for key, vector in remote_found.items():
+                self._set_local(key, vector)
+                found[key] = vector
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, list]):
+        for key, vector in items.items():
+            self._set_local(key, vector)
+        try:
+            self.remote.set_many(items, timeout=self.ttl)
+        except Exception as e:
+            print(f"[EmbeddingCache] Remote store failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "local_size": len(self._local),
+            }
+
+
+_embedding_cache = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Returns the process-wide cache so the local LRU survives across tasks in a worker.
+    """
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
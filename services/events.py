@@ -0,0 +1,104 @@
+import asyncio
+import json
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+# Events buffered per connection; a client that falls this far behind misses events
+EVENT_QUEUE_SIZE = 100
+
+
+def source_channel(source_id) -> str:
+    return f"source-events:{source_id}"
+
+
+_publisher = None
+
+
+def publish_source_event(source_id, stage: str, **data):
+    """
+    Publishes an ingest pipeline event for a source, e.g. ("fetched", status=...) or
+    ("cards_created", count=...). Fire-and-forget: failures are logged, never raised.
+    """
+    global _publisher
+    event = {"source": source_id, "stage": stage, **data}
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        _publisher.publish(source_channel(source_id), json.dumps(event, default=str))
+    except Exception as e:
+        print(f"[Events] Failed to publish {stage} for source {source_id}: {e}")
+
+
+class EventHub:
+    """
+    Fans Redis pub/sub messages out to the SSE connections of one ASGI process.
+    All connections share a single Redis connection; a channel stays subscribed while
+    at least one connection listens to it.
+    """
+
+    def __init__(self):
+        self.pubsub = aioredis.Redis.from_url(settings.EVENTS_REDIS_URL).pubsub(ignore_subscribe_messages=True)
+        self.queues = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.listener = None
+
+    @asynccontextmanager
+    async def subscribe(self, source_id):
+        """
+        Yields a queue receiving the source's events until the block exits.
+        """
+        channel = source_channel(source_id)
+        queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        async with self.lock:
+            if not self.queues[channel]:
+                await self.pubsub.subscribe(channel)
+            self.queues[channel].add(queue)
+            if self.listener is None or self.listener.done():
+                self.listener = asyncio.create_task(self._listen())
+        try:
+            yield queue
+        finally:
+            async with self.lock:
+                self.queues[channel].discard(queue)
+                if not self.queues[channel]:
+                    del self.queues[channel]
+                    await self.pubsub.unsubscribe(channel)
+
+    async def _listen(self):
+        while self.queues:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as e:
+                # The subscription is restored when the connection comes back
+                print(f"[Events] Subscription error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if not message or message["type"] != "message":
+                continue
+
+            channel = message["channel"].decode()
+            event = json.loads(message["data"])
+            for queue in list(self.queues.get(channel, ())):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    print(f"[Events] Dropping {event['stage']} event for a slow client on {channel}")
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_event_hub() -> EventHub:
+    """
+    Returns the EventHub of the running event loop (one per ASGI worker).
+    """
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = EventHub()
+    return hub
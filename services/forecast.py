@@ -0,0 +1,161 @@
+from datetime import timedelta
+import numpy as np
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from services.scheduler import sm2_step
+
+# Used when there is too little review history to estimate ratings from
+DEFAULT_RATING_PROBS = np.array([0.02, 0.03, 0.05, 0.20, 0.40, 0.30])
+MIN_LOGS_FOR_ESTIMATE = 50
+# Upper bound on simulated buckets (distinct card states x runs); decks with many states get fewer runs
+SIMULATION_BUDGET = 200_000
+# Below this many runs the spread between runs is noise, so no p10/p90 is reported
+MIN_RUNS_FOR_PERCENTILES = 20
+# Eases within this distance count as the same state when buckets are merged
+EASE_RESOLUTION = 1e-6
+
+
+def estimate_rating_distribution(review_logs) -> np.ndarray:
+    """
+    Probability of each rating 0-5 from a ReviewLog queryset, with add-one smoothing.
+    Falls back to DEFAULT_RATING_PROBS when there are fewer than MIN_LOGS_FOR_ESTIMATE logs.
+    """
+    counts = np.zeros(6)
+    for rating, count in review_logs.values_list('rating').annotate(count=Count('id')).order_by():
+        if 0 <= rating <= 5:
+            counts[rating] = count
+    if counts.sum() < MIN_LOGS_FOR_ESTIMATE:
+        return DEFAULT_RATING_PROBS
+    counts += 1
+    return counts / counts.sum()
+
+
+def load_schedule(cards):
+    """
+    Loads SM-2 state for a Card queryset grouped into buckets of identical state, as arrays
+    (eases, intervals, repetitions, due_days, counts). The grouping runs in the database, so
+    only one row per distinct state is read. due_days counts calendar days from today;
+    overdue cards are due today (0).
+    """
+    rows = list(
+        cards.order_by()
+        .annotate(due_date=TruncDate('next_review_at'))
+        .values_list('sm2_ease', 'sm2_interval', 'sm2_repetitions', 'due_date')
+        .annotate(count=Count('id'))
+    )
+    if not rows:
+        empty = np.array([], dtype=np.int64)
+        return np.array([], dtype=np.float64), empty, empty, empty, empty
+
+    eases, intervals, repetitions, due_dates, counts = zip(*rows)
+    today = timezone.localdate()
+    due_days = np.fromiter(((due - today).days for due in due_dates), dtype=np.int64, count=len(rows))
+    return (
+        np.array(eases, dtype=np.float64),
+        np.array(intervals, dtype=np.int64),
+        np.array(repetitions, dtype=np.int64),
+        np.maximum(due_days, 0),
+        np.array(counts, dtype=np.int64),
+    )
+
+
+def merge_buckets(run_ids, due_days, eases, intervals, repetitions, sizes, days):
+    """
+    Merges buckets that have reached the same state on the same day of the same run.
+    SM-2 treats every repetition count from 2 up alike, so those are merged too.
+    """
+    repetitions = np.minimum(repetitions, 2)
+    ease_values, ease_ids = np.unique(np.rint(eases / EASE_RESOLUTION), return_inverse=True)
+    # Buckets only stay in the pool while due_days (and so the last interval) is below days
+    keys = (((run_ids * days + due_days) * days + np.minimum(intervals, days)) * 3 + repetitions) * len(ease_values)
+    keys += ease_ids.ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    sizes = np.bincount(inverse.ravel(), weights=sizes).astype(np.int64)
+    return run_ids[first], due_days[first], eases[first], intervals[first], repetitions[first], sizes
+
+
+def simulate_workload(eases, intervals, repetitions, due_days, counts, rating_probs, days=30, runs=50, seed=None):
+    """
+    Monte Carlo forecast of reviews due per day over the next `days` days.
+    Cards are simulated as buckets of `counts` cards sharing one state: each iteration
+    splits every bucket due inside the horizon by a multinomial draw over the ratings
+    (the same distribution as rating each card on its own), advances the parts with SM-2
+    and merges parts that land in the same state. Work grows with the number of distinct
+    states rather than cards, so large decks keep a usable number of runs.
+    Returns {"mean", "p10", "p90", "runs"}; the arrays have length `days`. p10 and p90 are
+    None when fewer than MIN_RUNS_FOR_PERCENTILES runs fit in SIMULATION_BUDGET.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(eases)
+    runs = max(1, min(runs, SIMULATION_BUDGET // max(n, 1)))
+    totals = np.zeros(runs * days, dtype=np.int64)
+
+    # One copy of every bucket per run
+    run_ids = np.repeat(np.arange(runs, dtype=np.int64), n)
+    due_days = np.tile(due_days, runs)
+    active = due_days < days
+    run_ids, due_days = run_ids[active], due_days[active]
+    eases = np.tile(eases, runs)[active]
+    intervals = np.tile(intervals, runs)[active]
+    repetitions = np.tile(repetitions, runs)[active]
+    sizes = np.tile(counts, runs)[active]
+    run_ids, due_days, eases, intervals, repetitions, sizes = merge_buckets(
+        run_ids, due_days, eases, intervals, repetitions, sizes, days
+    )
+
+    ratings = np.arange(6)
+    while sizes.size:
+        totals += np.bincount(run_ids * days + due_days, weights=sizes, minlength=runs * days).astype(np.int64)
+
+        # Split every bucket into one part per rating and drop the empty parts
+        split = rng.multinomial(sizes, rating_probs)
+        parent, rating = np.nonzero(split)
+        sizes = split[parent, rating]
+        eases, intervals, repetitions = sm2_step(ratings[rating], eases[parent], intervals[parent], repetitions[parent])
+        run_ids = run_ids[parent]
+        due_days = due_days[parent] + intervals
+
+        active = due_days < days
+        run_ids, due_days, eases, intervals, repetitions, sizes = merge_buckets(
+            run_ids[active], due_days[active], eases[active], intervals[active], repetitions[active], sizes[active], days
+        )
+
+    per_run = totals.reshape(runs, days)
+    percentiles = runs >= MIN_RUNS_FOR_PERCENTILES
+    return {
+        "mean": per_run.mean(axis=0),
+        "p10": np.percentile(per_run, 10, axis=0) if percentiles else None,
+        "p90": np.percentile(per_run, 90, axis=0) if percentiles else None,
+        "runs": runs,
+    }
+
+
+def forecast_reviews(cards, review_logs, days=30, runs=50, seed=None) -> dict:
+    """
+    Forecasts daily review counts for a Card queryset, with ratings drawn from review_logs.
+    p10/p90 are null when the deck has too many distinct states for MIN_RUNS_FOR_PERCENTILES runs.
+    """
+    rating_probs = estimate_rating_distribution(review_logs)
+    eases, intervals, repetitions, due_days, counts = load_schedule(cards)
+    workload = simulate_workload(
+        eases, intervals, repetitions, due_days, counts, rating_probs, days=days, runs=runs, seed=seed
+    )
+
+    today = timezone.localdate()
+    p10, p90 = workload["p10"], workload["p90"]
+    return {
+        "cards": int(counts.sum()),
+        "days": days,
+        "runs": workload["runs"],
+        "rating_distribution": [round(float(p), 4) for p in rating_probs],
+        "forecast": [
+            {
+                "date": (today + timedelta(days=day)).isoformat(),
+                "expected": round(float(workload["mean"][day]), 1),
+                "p10": float(p10[day]) if p10 is not None else None,
+                "p90": float(p90[day]) if p90 is not None else None,
+            }
+            for day in range(days)
+        ],
+    }
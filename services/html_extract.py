@@ -0,0 +1,156 @@
+from html.parser import HTMLParser
+from typing import Optional, Union
+
+from django.conf import settings
+
+# Elements whose content is dropped as boilerplate
+SKIP_TAGS = frozenset(["script", "style", "nav", "footer", "header"])
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalizes extracted text: strips each line, splits multi-headlines, drops blank lines.
+    """
+    # Break into lines and remove leading/trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+def decode_html(html: Union[bytes, str], encoding: Optional[str] = None) -> str:
+    """
+    Decodes an HTML body. encoding is the charset from the Content-Type header, which takes
+    precedence over <meta> declarations; without one the encoding is detected.
+    """
+    if isinstance(html, str):
+        return html
+    from bs4 import UnicodeDammit
+    known = [encoding] if encoding else []
+    return UnicodeDammit(html, known_definite_encodings=known, is_html=True).unicode_markup or ''
+
+
+class HTMLExtractor:
+    """
+    Turns an HTML document into readable text with boilerplate removed.
+    encoding (optional) is the charset the server declared for a bytes document.
+    """
+    name = None
+
+    def extract(self, html: Union[bytes, str], encoding: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+
+class SoupExtractor(HTMLExtractor):
+    """
+    Original extractor: builds a full BeautifulSoup tree with html.parser. Slowest, most lenient.
+    """
+    name = 'soup'
+
+    def extract(self, html, encoding=None):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(decode_html(html, encoding), 'html.parser')
+
+        # Remove script and style elements
+        for script in soup(list(SKIP_TAGS)):
+            script.decompose()
+
+        return clean_text(soup.get_text())
+
+
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+class StreamingExtractor(HTMLExtractor):
+    """
+    Event-based extractor on the stdlib tokenizer. Boilerplate is dropped during the parse
+    and no tree is built.
+    """
+    name = 'streaming'
+
+    def extract(self, html, encoding=None):
+        collector = _TextCollector()
+        collector.feed(decode_html(html, encoding))
+        collector.close()
+        return clean_text(''.join(collector.parts))
+
+
+class _LxmlTarget:
+    def __init__(self):
+        self.parts = []
+        self.skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+    def close(self):
+        return ''.join(self.parts)
+
+
+class LxmlExtractor(HTMLExtractor):
+    """
+    Event-based extractor on libxml2's HTML parser. Fastest; requires lxml.
+    """
+    name = 'lxml'
+
+    def extract(self, html, encoding=None):
+        from lxml import etree
+        # libxml2 only sniffs <meta> charsets, so decode first and hand it UTF-8
+        parser = etree.HTMLParser(
+            target=_LxmlTarget(), remove_comments=True, remove_pis=True, encoding='utf-8'
+        )
+        parser.feed(decode_html(html, encoding).encode('utf-8'))
+        return clean_text(parser.close())
+
+
+EXTRACTORS = {
+    extractor.name: extractor
+    for extractor in (SoupExtractor, StreamingExtractor, LxmlExtractor)
+}
+
+
+def lxml_available() -> bool:
+    try:
+        import lxml.etree  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_extractor(name: str = None) -> HTMLExtractor:
+    """
+    Returns the configured extractor. 'auto' picks lxml when installed, else streaming.
+    """
+    name = name or getattr(settings, 'HTML_EXTRACTOR', 'auto')
+    if name == 'auto':
+        name = 'lxml' if lxml_available() else 'streaming'
+    return EXTRACTORS[name]()
@@ -0,0 +1,34 @@
+from io import BytesIO
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+# Formats whose content is usually diagrams/screenshots; recompressed losslessly to keep text crisp
+LOSSLESS_FORMATS = {'PNG', 'GIF', 'BMP', 'TIFF'}
+
+
+def preprocess_image(path: str, max_side: int, quality: int, grayscale: bool = False) -> Tuple[bytes, str]:
+    """
+    Prepares an image for a vision call: applies its EXIF orientation, downscales it to fit
+    max_side x max_side, optionally converts it to grayscale and recompresses it.
+    Photos become JPEG at `quality`, lossless formats become optimized PNG.
+    Returns (encoded bytes, file extension). Metadata is not carried over.
+    """
+    with Image.open(path) as original:
+        lossless = original.format in LOSSLESS_FORMATS
+        image = ImageOps.exif_transpose(original)
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        if grayscale:
+            image = image.convert('LA' if has_alpha and lossless else 'L')
+
+        out = BytesIO()
+        if lossless:
+            image.save(out, format='PNG', optimize=True)
+            return out.getvalue(), '.png'
+
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        image.save(out, format='JPEG', quality=quality, optimize=True)
+        return out.getvalue(), '.jpg'
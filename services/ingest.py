@@ -1,39 +1,155 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
 import requests
-from bs4 import BeautifulSoup
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from services.html_extract import SoupExtractor, get_extractor
 
-def fetch_url_content(url):
+USER_AGENT = 'RecallForge/1.0 (Education/Research Bot)'
+
+
+@dataclass
+class FetchResult:
     """
-    Fetches and extracts text content from a URL.
-    Returns the extracted text or raises an exception.
+    Outcome of fetching a URL. When not_modified is True the server (or content hash)
+    confirmed the previous fetch is still current and text is None.
+    """
+    text: Optional[str]
+    content_hash: str
+    etag: str = ''
+    last_modified: str = ''
+    not_modified: bool = False
+    truncated: bool = False
+
+
+_session = None
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide pooled session: keep-alive connections, bounded per host.
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.FETCH_POOL_HOSTS,
+            pool_maxsize=settings.FETCH_POOL_MAXSIZE_PER_HOST,
+            pool_block=True,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update({'User-Agent': USER_AGENT})
+        _session = session
+    return _session
+
+
+def is_youtube_url(url: str) -> bool:
+    return "youtube.com" in url or "youtu.be" in url
+
+
+def header_charset(content_type: str) -> Optional[str]:
+    """
+    The charset parameter of a Content-Type header, if any. Unlike requests' own
+    guess, a missing charset stays None instead of defaulting to ISO-8859-1.
+    """
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            return value.strip().strip('"\'') or None
+    return None
+
+
+def extract_text(html, encoding: Optional[str] = None) -> str:
+    """
+    Extracts readable text from an HTML document with the configured extractor,
+    falling back to the BeautifulSoup extractor if it fails.
+    encoding is the charset declared in the response's Content-Type header.
+    """
+    extractor = get_extractor()
+    try:
+        return extractor.extract(html, encoding=encoding)
+    except Exception as e:
+        if extractor.name == SoupExtractor.name:
+            raise
+        print(f"[Ingest] {extractor.name} extractor failed ({e}), falling back to soup")
+        return SoupExtractor().extract(html, encoding=encoding)
+
+
+def _read_capped(response, max_bytes: int):
+    """
+    Streams a response body, stopping at max_bytes. Returns (body, truncated).
+    """
+    body = bytearray()
+    for block in response.iter_content(chunk_size=64 * 1024):
+        body.extend(block)
+        if len(body) >= max_bytes:
+            return bytes(body[:max_bytes]), True
+    return bytes(body), False
+
+
+def fetch_url(url: str, etag: str = '', last_modified: str = '', previous_hash: str = '',
+              max_bytes: Optional[int] = None) -> FetchResult:
+    """
+    Fetches a URL and extracts its text.
+    Sends a conditional GET when etag/last_modified are known, and skips extraction when the
+    server answers 304 or the body hashes to previous_hash.
     """
     try:
         # Check for YouTube
-        if "youtube.com" in url or "youtu.be" in url:
+        if is_youtube_url(url):
             from services.youtube import YouTubeService
-            yt = YouTubeService()
-            return yt.extract_transcript(url)
-
-        headers = {
-            'User-Agent': 'RecallForge/1.0 (Education/Research Bot)'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-            
-        text = soup.get_text()
-        
-        # Break into lines and remove leading/trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text
+            text = YouTubeService().extract_transcript(url)
+            content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            if previous_hash and content_hash == previous_hash:
+                return FetchResult(text=None, content_hash=content_hash, not_modified=True)
+            return FetchResult(text=text, content_hash=content_hash)
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        max_bytes = max_bytes or settings.FETCH_MAX_BYTES
+        with get_session().get(url, headers=headers, timeout=settings.FETCH_TIMEOUT, stream=True) as response:
+            if response.status_code == 304:
+                return FetchResult(
+                    text=None, content_hash=previous_hash, etag=etag,
+                    last_modified=last_modified, not_modified=True
+                )
+            response.raise_for_status()
+            body, truncated = _read_capped(response, max_bytes)
+            new_etag = response.headers.get('ETag', '')
+            new_last_modified = response.headers.get('Last-Modified', '')
+            encoding = header_charset(response.headers.get('Content-Type', ''))
+
+        if truncated:
+            print(f"[Ingest] {url} exceeded {max_bytes} bytes, truncated")
+
+        content_hash = hashlib.sha256(body).hexdigest()
+        if previous_hash and content_hash == previous_hash:
+            return FetchResult(
+                text=None, content_hash=content_hash, etag=new_etag,
+                last_modified=new_last_modified, not_modified=True
+            )
+
+        return FetchResult(
+            text=extract_text(body, encoding=encoding),
+            content_hash=content_hash,
+            etag=new_etag,
+            last_modified=new_last_modified,
+            truncated=truncated,
+        )
     except Exception as e:
         raise Exception(f"Failed to fetch content: {str(e)}")
+
+
+def fetch_url_content(url):
+    """
+    Fetches and extracts text content from a URL.
+    Returns the extracted text or raises an exception.
+    """
+    return fetch_url(url).text
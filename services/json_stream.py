@@ -0,0 +1,60 @@
+import json
+from typing import Iterator
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for a streamed JSON array of objects.
+    feed() takes the next piece of text and returns the objects that closed in it, so each
+    element can be used before the array is complete. Anything before the opening bracket
+    (e.g. a markdown fence) is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+
+    def feed(self, text: str) -> list:
+        self.buffer += text
+        objects = []
+        while self.position < len(self.buffer):
+            ch = self.buffer[self.position]
+            if not self.started:
+                self.started = ch == '['
+                self.depth = 1 if self.started else 0
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in '[{':
+                if self.depth == 1 and ch == '{':
+                    self.object_start = self.position
+                self.depth += 1
+            elif ch in ']}':
+                self.depth -= 1
+                if self.depth == 1 and self.object_start is not None:
+                    objects.append(json.loads(self.buffer[self.object_start:self.position + 1]))
+                    self.object_start = None
+            self.position += 1
+
+        # Only the still-open object needs to stay buffered
+        keep_from = self.object_start if self.object_start is not None else self.position
+        self.buffer = self.buffer[keep_from:]
+        self.position -= keep_from
+        if self.object_start is not None:
+            self.object_start = 0
+        return objects
+
+    def iter_objects(self, chunks) -> Iterator:
+        for chunk in chunks:
+            yield from self.feed(chunk)
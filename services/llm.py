@@ -1,8 +1,96 @@
 import os
 import json
+import hashlib
 import google.generativeai as genai
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from django.conf import settings
+from services.embedding_cache import embedding_key, get_embedding_cache
+from services.json_stream import JSONArrayStream
+from services.llm_cache import response_cache_key, get_response_cache
+from services.uploads import UploadManager, file_part
+from google.api_core import exceptions as google_exceptions
+
+GENERATION_MODEL = "gemini-2.0-flash"
+EMBEDDING_MODEL = "models/text-embedding-004"
+EMBEDDING_DIM = 768
+# Gemini's batchEmbedContents accepts at most 100 requests per call
+EMBEDDING_BATCH_SIZE = 100
+
+# Longest text sent in a single generation prompt; longer sources are chunked upstream
+MAX_PROMPT_CHARS = 15000
+
+CARD_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.7,  # Some creativity but not too random
+}
+
+
+class EmbeddingError(Exception):
+    """
+    Gemini could not embed some of the requested texts.
+    """
+
+
+def estimate_card_count(text: str) -> int:
+    """
+    Card budget for a piece of text: roughly 1 card per 75 words, between 3 and 20.
+    """
+    word_count = len(text.split())
+    return max(3, min(20, word_count // 75))
+
+
+def parse_json_response(content: str):
+    """
+    Parses a JSON response, stripping markdown fences the model sometimes adds.
+    """
+    if content.startswith("```json"):
+        content = content[7:-3]
+    elif content.startswith("```"):
+        content = content[3:-3]
+    return json.loads(content)
+
+
+def card_key(front: str) -> str:
+    """
+    Normalized question used to spot duplicate cards (case/whitespace/punctuation-insensitive).
+    """
+    return " ".join("".join(ch for ch in front.lower() if ch.isalnum() or ch.isspace()).split())
+
+
+def normalize_cards(cards: List[Dict]) -> List[Dict]:
+    """
+    Validates raw model output into card dicts, dropping cards without a front or back.
+    """
+    normalized = []
+    for card in cards:
+        if not isinstance(card, dict):
+            continue
+        normalized_card = {
+            "front": card.get("front", ""),
+            "back": card.get("back", ""),
+            "hint": card.get("hint"),
+            "difficulty": card.get("difficulty", "basic"),
+            "tags": card.get("tags", []),
+            "visual_payload": card.get("visual_payload")
+        }
+        if normalized_card["front"] and normalized_card["back"]:
+            normalized.append(normalized_card)
+    return normalized
+
+
+def dedupe_cards(cards: List[Dict]) -> List[Dict]:
+    """
+    Drops cards whose question duplicates an earlier card (case/whitespace/punctuation-insensitive).
+    """
+    seen = set()
+    unique = []
+    for card in cards:
+        key = card_key(card["front"])
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(card)
+    return unique
 
 # Sophisticated prompt templates for high-quality flashcard generation
 FLASHCARD_SYSTEM_PROMPT = """You are an expert educational content designer specializing in spaced repetition learning. 
@@ -73,6 +161,9 @@ Create {num_cards} flashcards following these guidelines:
 
 Generate high-quality, educational flashcards now:"""
 
+# Changes whenever the system prompt changes, invalidating cached responses
+SYSTEM_PROMPT_VERSION = hashlib.sha256(FLASHCARD_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:12]
+
 
 class LLMService:
     def __init__(self):
@@ -84,81 +175,156 @@ class LLMService:
 
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(
-            'gemini-2.0-flash',
+            GENERATION_MODEL,
             system_instruction=FLASHCARD_SYSTEM_PROMPT
         )
 
-    def generate_cards(self, text: str, num_cards: Optional[int] = None) -> List[Dict[str, str]]:
+    def _generate_text(self, prompt: str, generation_config: Optional[dict] = None,
+                       use_cache: bool = True, parse=None):
         """
-        Generates high-quality flashcards from text using Gemini.
-        Returns a list of dicts with front, back, hint, difficulty, tags.
+        Runs a text prompt through Gemini, consulting the response cache first.
+        parse (optional) converts the response text; responses it rejects are not cached.
+        use_cache=False skips the lookup but still stores the fresh response.
         """
-        if not self.model:
-            raise ValueError("Gemini API Key is missing. Please set GEMINI_API_KEY in .env")
+        cache = get_response_cache()
+        key = response_cache_key(GENERATION_MODEL, SYSTEM_PROMPT_VERSION, prompt, generation_config)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return parse(cached) if parse else cached
+
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(**generation_config) if generation_config else None
+        )
+        text = response.text
+        result = parse(text) if parse else text
+        cache.set(key, text)
+        return result
 
+    def _stream_text(self, prompt: str, generation_config: Optional[dict] = None,
+                     use_cache: bool = True, parse=None) -> Iterator[str]:
+        """
+        Streaming counterpart of _generate_text: yields the response text as it arrives
+        (a cached response is yielded whole). The complete response is cached once the
+        stream ends, if parse (optional) accepts it.
+        """
+        cache = get_response_cache()
+        key = response_cache_key(GENERATION_MODEL, SYSTEM_PROMPT_VERSION, prompt, generation_config)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(**generation_config) if generation_config else None,
+            stream=True
+        )
+        parts = []
+        for chunk in response:
+            parts.append(chunk.text)
+            yield chunk.text
+        text = "".join(parts)
+        if parse:
+            try:
+                parse(text)
+            except ValueError as e:
+                # Everything was yielded already; only the cache write is skipped
+                print(f"Not caching unparseable streamed response: {e}")
+                return
+        cache.set(key, text)
+
+    def _card_prompt(self, text: str, num_cards: Optional[int] = None) -> str:
         # Estimate appropriate number of cards based on content length
         if num_cards is None:
-            word_count = len(text.split())
-            # Roughly 1 card per 50-100 words of content
-            num_cards = max(3, min(20, word_count // 75))
+            num_cards = estimate_card_count(text)
 
-        prompt = FLASHCARD_GENERATION_PROMPT.format(
-            content=text[:15000],  # Increased context window
+        if len(text) > MAX_PROMPT_CHARS:
+            print(f"WARNING: Truncating {len(text)} chars to {MAX_PROMPT_CHARS}; chunk long sources before generating.")
+
+        return FLASHCARD_GENERATION_PROMPT.format(
+            content=text[:MAX_PROMPT_CHARS],
             num_cards=num_cards
         )
 
+    def generate_cards(self, text: str, num_cards: Optional[int] = None,
+                       use_cache: bool = True) -> List[Dict[str, str]]:
+        """
+        Generates high-quality flashcards from text using Gemini.
+        Returns a list of dicts with front, back, hint, difficulty, tags.
+        """
+        if not self.model:
+            raise ValueError("Gemini API Key is missing. Please set GEMINI_API_KEY in .env")
+
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    response_mime_type="application/json",
-                    temperature=0.7,  # Some creativity but not too random
-                )
+            cards = self._generate_text(
+                self._card_prompt(text, num_cards),
+                generation_config=CARD_GENERATION_CONFIG,
+                use_cache=use_cache,
+                parse=parse_json_response
             )
             
-            content = response.text
-            # Clean up potential markdown fences
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-                
-            cards = json.loads(content)
-            
             # Validate and normalize card structure
-            validated_cards = []
-            for card in cards:
-                validated_card = {
-                    "front": card.get("front", ""),
-                    "back": card.get("back", ""),
-                    "hint": card.get("hint"),
-                    "difficulty": card.get("difficulty", "basic"),
-                    "tags": card.get("tags", []),
-                    "visual_payload": card.get("visual_payload")
-                }
-                if validated_card["front"] and validated_card["back"]:
-                    validated_cards.append(validated_card)
-                    
-            return validated_cards
+            return normalize_cards(cards)
             
         except Exception as e:
             print(f"Error generating cards with Gemini: {e}")
             raise e
 
-    def generate_cards_from_file(self, file_path: str) -> List[Dict[str, str]]:
+    def stream_cards(self, text: str, num_cards: Optional[int] = None,
+                     use_cache: bool = True) -> Iterator[Dict[str, str]]:
         """
-        Generates flashcards from a file (Image/PDF) using Gemini Vision.
+        Like generate_cards, but yields each card as soon as its JSON object is complete
+        in the streamed response.
         """
         if not self.model:
-            raise ValueError("Gemini API Key is missing.")
+            raise ValueError("Gemini API Key is missing. Please set GEMINI_API_KEY in .env")
+
+        chunks = self._stream_text(
+            self._card_prompt(text, num_cards),
+            generation_config=CARD_GENERATION_CONFIG,
+            use_cache=use_cache,
+            parse=parse_json_response
+        )
+        for card in JSONArrayStream().iter_objects(chunks):
+            yield from normalize_cards([card])
 
-        print(f"Uploading file to Gemini: {file_path}")
+    def generate_cards_from_file(self, file_path) -> List[Dict[str, str]]:
+        """
+        Generates flashcards from a file (Image/PDF), or a list of files, using Gemini Vision.
+        Files already uploaded (same content hash) are reused instead of uploaded again.
+        """
         try:
-            # Upload file to Gemini File API
-            sample_file = genai.upload_file(path=file_path, display_name="RecallForge Source")
-            print(f"File uploaded: {sample_file.uri}")
+            response = self._file_response(file_path)
+            return normalize_cards(parse_json_response(response.text))
+            
+        except Exception as e:
+            print(f"Error generating cards from file: {e}")
+            raise e
+
+    def stream_cards_from_file(self, file_path) -> Iterator[Dict[str, str]]:
+        """
+        Like generate_cards_from_file, but yields each card as soon as its JSON object is
+        complete in the streamed response.
+        """
+        response = self._file_response(file_path, stream=True)
+        chunks = (chunk.text for chunk in response)
+        for card in JSONArrayStream().iter_objects(chunks):
+            yield from normalize_cards([card])
+
+    def _file_response(self, file_path, stream: bool = False):
+        """
+        Sends the vision prompt with the (uploaded) files and returns Gemini's response.
+        """
+        if not self.model:
+            raise ValueError("Gemini API Key is missing.")
 
-            prompt = """Analyze this educational material (image, diagram, or document).
+        file_paths = [file_path] if isinstance(file_path, str) else list(file_path)
+        uploads = UploadManager()
+        handles = uploads.get_handles(file_paths)
+        prompt = """Analyze this educational material (image, diagram, or document).
             
 Extract ALL key concepts, facts, definitions, and relationships visible.
 Create high-quality flashcards following these principles:
@@ -186,27 +352,25 @@ For each card, provide:
 
 Return ONLY a valid JSON array."""
 
-            response = self.model.generate_content(
-                [sample_file, prompt],
-                generation_config=genai.types.GenerationConfig(
-                    response_mime_type="application/json",
-                    temperature=0.7,
-                )
+        generation_config = genai.types.GenerationConfig(**CARD_GENERATION_CONFIG)
+        try:
+            return self.model.generate_content(
+                [*(file_part(handle) for handle in handles), prompt],
+                generation_config=generation_config,
+                stream=stream
+            )
+        except (google_exceptions.NotFound, google_exceptions.PermissionDenied) as e:
+            # A cached handle was deleted or expired early on Gemini's side: upload afresh once
+            print(f"Cached upload rejected ({e}), re-uploading")
+            uploads.forget(file_paths)
+            handles = uploads.get_handles(file_paths, refresh=True)
+            return self.model.generate_content(
+                [*(file_part(handle) for handle in handles), prompt],
+                generation_config=generation_config,
+                stream=stream
             )
 
-            content = response.text
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-                
-            return json.loads(content)
-            
-        except Exception as e:
-            print(f"Error generating cards from file: {e}")
-            raise e
-
-    def summarize_content(self, text: str) -> str:
+    def summarize_content(self, text: str, use_cache: bool = True) -> str:
         """
         Generates a concise summary of the text.
         """
@@ -224,31 +388,62 @@ Content:
 {text[:20000]}
 """
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return self._generate_text(prompt, use_cache=use_cache)
         except Exception as e:
             return f"Error summarizing text: {e}"
 
-    def get_embedding(self, text: str) -> list:
+    def get_embedding(self, text: str, task_type: str = "retrieval_document") -> list:
         """
         Generate embedding vector for text using Gemini's embedding model.
-        Returns a 768-dimensional vector.
+        Returns a 768-dimensional vector; raises EmbeddingError if Gemini fails.
+        """
+        return self.get_embeddings([text], task_type=task_type)[0]
+
+    def get_embeddings(self, texts: List[str], task_type: str = "retrieval_document",
+                       batch_size: int = EMBEDDING_BATCH_SIZE, allow_partial: bool = False) -> List[Optional[list]]:
+        """
+        Generate embeddings for many texts using batched embedding requests.
+        Texts already in the embedding cache are not sent to Gemini.
+        Returns one 768-dimensional vector per input text, in order. If a batch fails,
+        raises EmbeddingError, or with allow_partial=True returns None for its texts
+        (successful batches are cached either way).
         """
         if not self.model:
             raise ValueError("Gemini API Key is missing.")
-        
-        try:
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=text[:8000],
-                task_type="retrieval_document"
-            )
-            return result['embedding']
-        except Exception as e:
-            print(f"Error generating embedding: {e}")
-            return [0.0] * 768
 
-    def improve_card(self, front: str, back: str) -> Dict[str, str]:
+        cache = get_embedding_cache()
+        texts = [text[:8000] for text in texts]
+        keys = [embedding_key(text, EMBEDDING_MODEL, task_type) for text in texts]
+        cached = cache.get_many(list(set(keys)))
+
+        # Embed each distinct uncached text once
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in pending:
+                pending[key] = text
+
+        pending_keys = list(pending)
+        for start in range(0, len(pending_keys), batch_size):
+            batch_keys = pending_keys[start:start + batch_size]
+            try:
+                result = genai.embed_content(
+                    model=EMBEDDING_MODEL,
+                    content=[pending[key] for key in batch_keys],
+                    task_type=task_type
+                )
+                fresh = dict(zip(batch_keys, result['embedding']))
+                cache.set_many(fresh)
+                cached.update(fresh)
+            except Exception as e:
+                print(f"Error generating batch embedding: {e}")
+
+        embeddings = [cached.get(key) for key in keys]
+        failed = sum(embedding is None for embedding in embeddings)
+        if failed and not allow_partial:
+            raise EmbeddingError(f"{failed} of {len(texts)} texts could not be embedded")
+        return embeddings
+
+    def improve_card(self, front: str, back: str, use_cache: bool = True) -> Dict[str, str]:
         """
         Takes an existing card and improves its quality.
         Useful for user-created cards.
@@ -271,12 +466,11 @@ Return JSON:
 {{"front": "improved question", "back": "improved answer", "hint": "memory aid", "difficulty": "basic|intermediate|advanced", "tags": ["tag1", "tag2"]}}
 """
         try:
-            response = self.model.generate_content(
+            return self._generate_text(
                 prompt,
-                generation_config=genai.types.GenerationConfig(
-                    response_mime_type="application/json"
-                )
+                generation_config={"response_mime_type": "application/json"},
+                use_cache=use_cache,
+                parse=json.loads
             )
-            return json.loads(response.text)
         except:
             return {"front": front, "back": back}
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from django.conf import settings
+
+
+def response_cache_key(model: str, prompt_version: str, prompt: str, generation_config: Optional[dict]) -> str:
+    """
+    Cache key for an LLM response: (model, system prompt version, prompt hash, generation config).
+    """
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    material = json.dumps(
+        {"model": model, "prompt_version": prompt_version, "prompt": prompt_hash, "config": generation_config or {}},
+        sort_keys=True,
+    )
+    return "llm:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class RedisResponseBackend:
+    """
+    Stores responses in Redis with a per-key TTL.
+    A sorted set of keys by last use bounds the number of entries (least recently used go first).
+    """
+    INDEX_KEY = "llm:index"
+
+    def __init__(self, location: str, ttl: int, max_entries: int):
+        import redis
+        self.client = redis.Redis.from_url(location)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        if value is None:
+            return None
+        self.client.zadd(self.INDEX_KEY, {key: time.time()})
+        return value.decode("utf-8")
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        pipe = self.client.pipeline()
+        pipe.set(key, value, ex=self.ttl)
+        pipe.zadd(self.INDEX_KEY, {key: now})
+        # Entries older than the TTL have already expired in Redis
+        pipe.zremrangebyscore(self.INDEX_KEY, 0, now - self.ttl)
+        pipe.zcard(self.INDEX_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - self.max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in self.client.zpopmin(self.INDEX_KEY, overflow)]
+            if evicted:
+                self.client.delete(*evicted)
+
+
+class FileResponseBackend:
+    """
+    Stores one JSON file per response under a local directory. Intended for tests and development.
+    File modification times track last use for eviction.
+    """
+
+    def __init__(self, location, ttl: int, max_entries: int):
+        self.directory = Path(location)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key.replace(':', '_')}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry["expires_at"] < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return entry["value"]
+
+    def set(self, key: str, value: str):
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"expires_at": time.time() + self.ttl, "value": value}), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        entries = list(self.directory.glob("*.json"))
+        overflow = len(entries) - self.max_entries
+        if overflow > 0:
+            entries.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in entries[:overflow]:
+                entry.unlink(missing_ok=True)
+
+
+BACKENDS = {
+    "redis": RedisResponseBackend,
+    "file": FileResponseBackend,
+}
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of raw LLM response text. Backend failures are logged and treated as misses.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config if config is not None else settings.LLM_RESPONSE_CACHE
+        backend_name = config.get("BACKEND")
+        self.backend = None
+        if backend_name:
+            self.backend = BACKENDS[backend_name](
+                config["LOCATION"], config.get("TTL", 60 * 60 * 24 * 7), config.get("MAX_ENTRIES", 10000)
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"[LLMCache] Lookup failed: {e}")
+            return None
+
+    def set(self, key: str, value: str):
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            print(f"[LLMCache] Store failed: {e}")
+
+
+_response_cache = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache
@@ -0,0 +1,69 @@
+from typing import Iterable, List
+
+from pypdf import PdfReader, PdfWriter
+
+
+def is_pdf(path: str) -> bool:
+    return path.lower().endswith('.pdf')
+
+
+def page_count(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+def page_groups(pages: Iterable[int], pages_per_group: int) -> List[List[int]]:
+    """
+    Splits page indices, in document order, into groups of at most pages_per_group pages.
+    Pages need not be consecutive: scattered pages share a group.
+    """
+    pages = sorted(pages)
+    return [pages[start:start + pages_per_group] for start in range(0, len(pages), pages_per_group)]
+
+
+def describe_pages(pages: Iterable[int]) -> str:
+    """
+    Human-readable 1-based page list for page indices, e.g. [0, 1, 2, 5] -> "1-3, 6".
+    """
+    runs = []
+    for page in sorted(pages):
+        if runs and runs[-1][1] == page - 1:
+            runs[-1][1] = page
+        else:
+            runs.append([page, page])
+    return ", ".join(f"{first + 1}" if first == last else f"{first + 1}-{last + 1}" for first, last in runs)
+
+
+def page_texts(path: str) -> List[str]:
+    """
+    Text layer of each page; pages whose text cannot be extracted come back empty.
+    """
+    texts = []
+    for page in PdfReader(path).pages:
+        try:
+            texts.append(page.extract_text() or '')
+        except Exception as e:
+            print(f"[PDF] Text extraction failed on a page of {path}: {e}")
+            texts.append('')
+    return texts
+
+
+def has_text_layer(text: str, min_chars: int) -> bool:
+    """
+    True if a page carries enough real text to generate from without vision.
+    Scanned pages have none; diagram-heavy pages usually only have labels.
+    """
+    return sum(ch.isalnum() for ch in text) >= min_chars
+
+
+def extract_pages(path: str, pages: Iterable[int], out_path: str):
+    """
+    Copies the given pages of a PDF, in order, into a new PDF at out_path. Output is
+    deterministic, so the same pages of the same file hash identically (and reuse their
+    Gemini upload).
+    """
+    reader = PdfReader(path)
+    writer = PdfWriter()
+    for page in pages:
+        writer.add_page(reader.pages[page])
+    with open(out_path, 'wb') as f:
+        writer.write(f)
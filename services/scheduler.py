@@ -1,10 +1,15 @@
-from datetime import timedelta
+from datetime import timedelta, timezone as dt_timezone
+import numpy as np
 from django.utils import timezone
 
-def calculate_next_review(rating, previous_ease=2.5, previous_interval=0, previous_repetitions=0):
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+def calculate_next_review(rating, previous_ease=DEFAULT_EASE, previous_interval=0, previous_repetitions=0, reviewed_at=None):
     """
     Implements SM-2 Algorithm.
     rating: 0-5
+    reviewed_at: when the review happened (defaults to now); the next date is relative to it
     Returns: (new_ease, new_interval, new_repetitions, next_review_date)
     """
     if rating >= 3:
@@ -14,16 +19,74 @@ def calculate_next_review(rating, previous_ease=2.5, previous_interval=0, previo
             interval = 6
         else:
             interval = round(previous_interval * previous_ease)
-        
+
         repetitions = previous_repetitions + 1
     else:
         repetitions = 0
         interval = 1
-    
+
     new_ease = previous_ease + (0.1 - (5 - rating) * (0.08 + (5 - rating) * 0.02))
-    if new_ease < 1.3:
-        new_ease = 1.3
-        
-    next_review_date = timezone.now() + timedelta(days=interval)
-    
+    if new_ease < MIN_EASE:
+        new_ease = MIN_EASE
+
+    next_review_date = (reviewed_at or timezone.now()) + timedelta(days=interval)
+
     return new_ease, interval, repetitions, next_review_date
+
+def to_datetime64(values):
+    """
+    Converts an aware datetime, or a sequence of them, to UTC datetime64[us].
+    """
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[us]')
+    if hasattr(values, 'tzinfo'):
+        return np.datetime64(values.astimezone(dt_timezone.utc).replace(tzinfo=None), 'us')
+    return np.array(
+        [value.astimezone(dt_timezone.utc).replace(tzinfo=None) for value in values],
+        dtype='datetime64[us]'
+    )
+
+def to_datetimes(values: np.ndarray) -> list:
+    """
+    Converts a UTC datetime64 array back to aware datetimes.
+    """
+    return [value.replace(tzinfo=dt_timezone.utc) for value in values.astype('datetime64[us]').tolist()]
+
+def sm2_step(ratings, eases, intervals, repetitions):
+    """
+    Vectorized SM-2 state update without dates.
+    Returns: (new_eases, new_intervals, new_repetitions)
+    """
+    ratings = np.asarray(ratings, dtype=np.int64)
+    eases = np.asarray(eases, dtype=np.float64)
+    intervals = np.asarray(intervals, dtype=np.int64)
+    repetitions = np.asarray(repetitions, dtype=np.int64)
+
+    passed = ratings >= 3
+    # np.rint rounds half to even, like Python's round()
+    grown = np.rint(intervals * eases).astype(np.int64)
+    new_intervals = np.where(
+        passed,
+        np.where(repetitions == 0, 1, np.where(repetitions == 1, 6, grown)),
+        1
+    )
+    new_repetitions = np.where(passed, repetitions + 1, 0)
+
+    misses = 5 - ratings
+    new_eases = eases + (0.1 - misses * (0.08 + misses * 0.02))
+    new_eases = np.where(new_eases < MIN_EASE, MIN_EASE, new_eases)
+
+    return new_eases, new_intervals, new_repetitions
+
+def calculate_next_reviews(ratings, eases, intervals, repetitions, reviewed_at=None):
+    """
+    Vectorized SM-2 over arrays of cards; matches calculate_next_review element-wise.
+    reviewed_at: aware datetime, sequence of them, or datetime64 array (defaults to now)
+    Returns: (new_eases, new_intervals, new_repetitions, next_review_dates as UTC datetime64[us])
+    """
+    new_eases, new_intervals, new_repetitions = sm2_step(ratings, eases, intervals, repetitions)
+
+    base = to_datetime64(reviewed_at if reviewed_at is not None else timezone.now())
+    next_dates = base + new_intervals.astype('timedelta64[D]')
+
+    return new_eases, new_intervals, new_repetitions, next_dates
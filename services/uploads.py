@@ -0,0 +1,160 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List
+
+import google.generativeai as genai
+from django.conf import settings
+from django.core.cache import cache
+
+# Display names of our uploads carry the file digest, so GC can map remote files back to cache entries
+DISPLAY_NAME_PREFIX = "recallforge:"
+# Untracked uploads younger than this may still be in use by the job that created them
+ORPHAN_GRACE = timedelta(hours=1)
+
+
+def file_digest(path: str) -> str:
+    """
+    SHA-256 of a local file, read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def upload_key(digest: str) -> str:
+    return f"gemini_upload:{digest}"
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=dt_timezone.utc)
+    return datetime.fromisoformat(value)
+
+
+class UploadManager:
+    """
+    Uploads files to the Gemini File API once per content hash.
+    Handles are cached (shared across workers and users) until shortly before Gemini expires
+    them, so re-ingesting the same PDF or image skips the upload entirely.
+    """
+
+    def __init__(self):
+        self.reuse_margin = timedelta(seconds=settings.GEMINI_UPLOAD_REUSE_MARGIN)
+
+    def _cached_handle(self, digest: str):
+        try:
+            handle = cache.get(upload_key(digest))
+        except Exception as e:
+            print(f"[Upload] Cache lookup failed: {e}")
+            return None
+        if handle and _as_datetime(handle['expires_at']) - self.reuse_margin > datetime.now(dt_timezone.utc):
+            return handle
+        return None
+
+    def _wait_until_active(self, remote):
+        # PDFs and videos are processed after upload; images are usable immediately
+        deadline = time.monotonic() + settings.GEMINI_UPLOAD_PROCESSING_TIMEOUT
+        while remote.state.name == "PROCESSING":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Gemini is still processing {remote.name}")
+            time.sleep(1)
+            remote = genai.get_file(remote.name)
+        if remote.state.name == "FAILED":
+            raise ValueError(f"Gemini failed to process {remote.name}")
+        return remote
+
+    def _upload(self, path: str, digest: str) -> Dict:
+        started = time.perf_counter()
+        remote = genai.upload_file(path=path, display_name=f"{DISPLAY_NAME_PREFIX}{digest}")
+        remote = self._wait_until_active(remote)
+        print(f"[Upload] Uploaded {path} as {remote.name} in {time.perf_counter() - started:.1f}s")
+
+        expires_at = _as_datetime(remote.expiration_time)
+        handle = {
+            "name": remote.name,
+            "uri": remote.uri,
+            "mime_type": remote.mime_type,
+            "expires_at": expires_at.isoformat(),
+        }
+        timeout = (expires_at - datetime.now(dt_timezone.utc) - self.reuse_margin).total_seconds()
+        if timeout > 0:
+            try:
+                cache.set(upload_key(digest), handle, timeout=int(timeout))
+            except Exception as e:
+                print(f"[Upload] Cache store failed: {e}")
+        return handle
+
+    def get_handles(self, paths: List[str], refresh: bool = False) -> List[Dict]:
+        """
+        Returns a {"name", "uri", "mime_type", "expires_at"} handle per path, uploading only
+        files without a still-valid cached handle. Misses are uploaded concurrently and
+        identical files are uploaded once. refresh=True ignores cached handles.
+        """
+        digests = [file_digest(path) for path in paths]
+        handles = {}
+        missing = {}
+        for path, digest in zip(paths, digests):
+            if digest in handles or digest in missing:
+                continue
+            handle = None if refresh else self._cached_handle(digest)
+            if handle:
+                print(f"[Upload] Reusing {handle['name']} for {path}")
+                handles[digest] = handle
+            else:
+                missing[digest] = path
+
+        if missing:
+            workers = min(len(missing), settings.GEMINI_UPLOAD_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                uploaded = pool.map(lambda item: self._upload(item[1], item[0]), missing.items())
+                handles.update(zip(missing, uploaded))
+
+        return [handles[digest] for digest in digests]
+
+    def forget(self, paths: List[str]):
+        """
+        Drops cached handles for these files, e.g. after Gemini rejected one as missing.
+        """
+        for path in paths:
+            try:
+                cache.delete(upload_key(file_digest(path)))
+            except Exception as e:
+                print(f"[Upload] Cache delete failed: {e}")
+
+    def collect_garbage(self) -> int:
+        """
+        Deletes our remote files that will not be reused: those within the reuse margin of
+        expiry and those no cache entry points to (superseded or evicted). Returns the count.
+        """
+        now = datetime.now(dt_timezone.utc)
+        deleted = 0
+        for remote in genai.list_files():
+            if not (remote.display_name or '').startswith(DISPLAY_NAME_PREFIX):
+                continue
+            digest = remote.display_name[len(DISPLAY_NAME_PREFIX):]
+            try:
+                handle = cache.get(upload_key(digest))
+            except Exception as e:
+                print(f"[Upload] Cache lookup failed, stopping GC: {e}")
+                break
+            expiring = _as_datetime(remote.expiration_time) - self.reuse_margin <= now
+            orphaned = (not handle or handle['name'] != remote.name) and _as_datetime(remote.create_time) + ORPHAN_GRACE <= now
+            if expiring or orphaned:
+                try:
+                    genai.delete_file(remote.name)
+                    deleted += 1
+                except Exception as e:
+                    print(f"[Upload] Failed to delete {remote.name}: {e}")
+        print(f"[Upload] Garbage-collected {deleted} uploads")
+        return deleted
+
+
+def file_part(handle: Dict):
+    """
+    Prompt part referencing an uploaded file by URI, without re-fetching its metadata.
+    """
+    return genai.protos.FileData(mime_type=handle["mime_type"], file_uri=handle["uri"])
@@ -1,31 +1,184 @@
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from django.conf import settings
-import uuid
+
+COLLECTION_NAME = "cards"
+
+
+def search_filter(deck_id=None, owner_id=None):
+    """
+    Server-side payload filter for card searches, or None when unfiltered.
+    """
+    conditions = []
+    if deck_id is not None:
+        conditions.append(models.FieldCondition(key="deck_id", match=models.MatchValue(value=int(deck_id))))
+    if owner_id is not None:
+        conditions.append(models.FieldCondition(key="owner_id", match=models.MatchValue(value=int(owner_id))))
+    return models.Filter(must=conditions) if conditions else None
+
 
 class VectorService:
+    # Payload fields used to filter searches server-side
+    INDEXED_FIELDS = ("deck_id", "owner_id")
+
     def __init__(self):
         self.client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-        self.collection_name = "cards"
+        self.collection_name = COLLECTION_NAME
         self._ensure_collection()
 
     def _ensure_collection(self):
         try:
-            self.client.get_collection(self.collection_name)
+            info = self.client.get_collection(self.collection_name)
+            indexed = set((info.payload_schema or {}).keys())
         except Exception:
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=models.VectorParams(size=768, distance=models.Distance.COSINE),
             )
+            indexed = set()
+
+        for field_name in self.INDEXED_FIELDS:
+            if field_name not in indexed:
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=models.PayloadSchemaType.INTEGER,
+                )
+
+    @staticmethod
+    def point_id(card_id) -> int:
+        """
+        Deterministic point ID for a card, so re-embedding overwrites the old point.
+        """
+        return int(card_id)
 
     def upsert_card(self, card_id, vector: list, payload: dict):
+        self.upsert_cards([(card_id, vector, payload)])
+
+    def upsert_cards(self, points: list):
+        """
+        Upsert many cards in a single request.
+        points: list of (card_id, vector, payload) tuples
+        """
+        if not points:
+            return
         self.client.upsert(
             collection_name=self.collection_name,
             points=[
                 models.PointStruct(
-                    id=str(uuid.uuid4()), # Qdrant prefers UUIDs or ints
+                    id=self.point_id(card_id),
                     vector=vector,
                     payload={"card_id": card_id, **payload}
                 )
+                for card_id, vector, payload in points
             ]
         )
+
+    def search(self, vector: list, limit: int = 10, deck_id=None, owner_id=None) -> list:
+        """
+        Nearest-neighbour search over card vectors, filtered by deck and/or owner.
+        Returns a list of (card_id, score) tuples, best match first.
+        """
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            query_filter=search_filter(deck_id, owner_id),
+            limit=limit,
+            with_payload=["card_id"],
+            with_vectors=False,
+        )
+        return [(point.payload["card_id"], point.score) for point in response.points]
+
+    def set_card_payload(self, card_ids: list, payload: dict):
+        """
+        Overwrite the given payload keys on the cards' points, keeping their vectors.
+        """
+        if not card_ids:
+            return
+        self.client.set_payload(
+            collection_name=self.collection_name,
+            payload=payload,
+            points=[self.point_id(card_id) for card_id in card_ids],
+        )
+
+    def delete_cards(self, card_ids: list):
+        """
+        Delete the points for the given cards.
+        """
+        self.delete_points([self.point_id(card_id) for card_id in card_ids])
+
+    def delete_points(self, point_ids: list):
+        if not point_ids:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=point_ids),
+        )
+
+    def iter_point_ids(self, batch_size: int = 1000):
+        """
+        Yields batches of point IDs in the collection, without vectors or payloads.
+        """
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            if records:
+                yield [record.id for record in records]
+            if offset is None:
+                break
+
+
+_vector_service = None
+
+
+def get_vector_service() -> VectorService:
+    """
+    Returns a process-wide VectorService so request paths skip the collection check.
+    """
+    global _vector_service
+    if _vector_service is None:
+        _vector_service = VectorService()
+    return _vector_service
+
+
+class AsyncVectorService:
+    """
+    Read-only async counterpart of VectorService for ASGI request paths.
+    The collection and its indexes are created by VectorService.
+    """
+    def __init__(self):
+        self.client = AsyncQdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
+        self.collection_name = COLLECTION_NAME
+
+    async def search(self, vector: list, limit: int = 10, deck_id=None, owner_id=None) -> list:
+        """
+        Same as VectorService.search, without blocking the event loop.
+        """
+        response = await self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            query_filter=search_filter(deck_id, owner_id),
+            limit=limit,
+            with_payload=["card_id"],
+            with_vectors=False,
+        )
+        return [(point.payload["card_id"], point.score) for point in response.points]
+
+
+_async_vector_service = None
+
+
+def get_async_vector_service() -> AsyncVectorService:
+    """
+    Returns a process-wide AsyncVectorService; ASGI workers run a single event loop.
+    """
+    global _async_vector_service
+    if _async_vector_service is None:
+        _async_vector_service = AsyncVectorService()
+    return _async_vector_service
@@ -1,8 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api.formatters import TextFormatter
+from django.conf import settings
+from django.core.cache import cache
 import yt_dlp
 import re
 
+# One YoutubeDL per worker process; it is not thread-safe, so calls are serialized
+_ydl = None
+_ydl_lock = threading.Lock()
+
+
+def get_ydl():
+    global _ydl
+    if _ydl is None:
+        _ydl = yt_dlp.YoutubeDL({'quiet': True, 'extract_flat': True})
+    return _ydl
+
+
 class YouTubeService:
     def get_video_id(self, url: str) -> str:
         """
@@ -23,58 +39,93 @@ class YouTubeService:
         """
         Fetches title, description, and thumbnail.
         """
-        ydl_opts = {'quiet': True, 'extract_flat': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            return {
-                "title": info.get('title'),
-                "description": info.get('description'),
-                "thumbnail": info.get('thumbnail')
-            }
+        with _ydl_lock:
+            info = get_ydl().extract_info(url, download=False)
+        return {
+            "title": info.get('title'),
+            "description": info.get('description'),
+            "thumbnail": info.get('thumbnail')
+        }
 
-    def extract_transcript(self, url: str) -> str:
+    def get_transcript(self, video_id: str) -> str:
         """
-        Extracts full transcript text from a YouTube URL.
+        Fetches the transcript for a video as plain text.
         """
+        # Get transcript using instance method .list()
+        api = YouTubeTranscriptApi()
+        transcript_list = api.list(video_id)
+
+        # Try fetching english, or auto-generated english
         try:
-            video_id = self.get_video_id(url)
-            
-            # Get transcript using instance method .list()
-            api = YouTubeTranscriptApi()
-            transcript_list = api.list(video_id)
-            
-            # Try fetching english, or auto-generated english
+            transcript = transcript_list.find_generated_transcript(['en'])
+        except:
             try:
-                transcript = transcript_list.find_generated_transcript(['en'])
+                transcript = transcript_list.find_manually_created_transcript(['en'])
             except:
+                # Fallback to any english or first available features
                 try:
-                    transcript = transcript_list.find_manually_created_transcript(['en'])
+                    transcript = transcript_list.find_transcript(['en'])
                 except:
-                    # Fallback to any english or first available features
-                    try:
-                        transcript = transcript_list.find_transcript(['en'])
-                    except:
-                        # iterate and pick first
-                        transcript = next(iter(transcript_list))
-            
-            transcript_data = transcript.fetch()
-            
-            # Format to plain text
-            formatter = TextFormatter()
-            text = formatter.format_transcript(transcript_data)
-            
-            # Get Metadata to prepend
-            meta = self.get_metadata(url)
-            
-            full_content = f"Title: {meta['title']}\nDescription: {meta['description']}\n\nTranscript:\n{text}"
-            return full_content
-            
+                    # iterate and pick first
+                    transcript = next(iter(transcript_list))
+
+        transcript_data = transcript.fetch()
+
+        # Format to plain text
+        formatter = TextFormatter()
+        return formatter.format_transcript(transcript_data)
+
+    def get_video(self, url: str) -> dict:
+        """
+        Returns {"metadata", "transcript", "transcript_error"} for a video, cached by video ID.
+        Transcript and metadata are fetched concurrently on a miss.
+        """
+        video_id = self.get_video_id(url)
+        cache_key = f"youtube:{video_id}"
+        try:
+            cached = cache.get(cache_key)
         except Exception as e:
-            # Fallback: Return metadata if transcript fails
+            print(f"[YouTube] Cache lookup failed: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        canonical_url = f"https://www.youtube.com/watch?v={video_id}"
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            transcript_future = pool.submit(self.get_transcript, video_id)
+            metadata_future = pool.submit(self.get_metadata, canonical_url)
+
+            transcript, transcript_error = None, None
             try:
-                meta = self.get_metadata(url)
-                return f"Title: {meta['title']}\nDescription: {meta['description']}\n\n(Transcript unavailable: {str(e)})"
-            except Exception as meta_error:
-                # Debug Mock for Development when Network is Blocked
-                print(f"Network error accessing YouTube: {meta_error}. Returning Mock Data.")
-                return f"Title: Mock Video (Network Blocked)\nDescription: This is a placeholder because YouTube is inaccessible.\n\nTranscript:\nThis is a mock transcript about Mitochondria. Mitochondria are the powerhouse of the cell. They generate ATP."
+                transcript = transcript_future.result()
+            except Exception as e:
+                transcript_error = str(e)
+            # Metadata failures propagate: without it there is nothing to ingest
+            metadata = metadata_future.result()
+
+        video = {"metadata": metadata, "transcript": transcript, "transcript_error": transcript_error}
+        # Missing transcripts may be published later, so they expire sooner
+        timeout = settings.YOUTUBE_CACHE_TTL if transcript is not None else settings.YOUTUBE_CACHE_MISS_TTL
+        try:
+            cache.set(cache_key, video, timeout=timeout)
+        except Exception as e:
+            print(f"[YouTube] Cache store failed: {e}")
+        return video
+
+    def extract_transcript(self, url: str) -> str:
+        """
+        Extracts full transcript text from a YouTube URL.
+        """
+        try:
+            video = self.get_video(url)
+        except Exception as meta_error:
+            # Debug Mock for Development when Network is Blocked
+            print(f"Network error accessing YouTube: {meta_error}. Returning Mock Data.")
+            return f"Title: Mock Video (Network Blocked)\nDescription: This is a placeholder because YouTube is inaccessible.\n\nTranscript:\nThis is a mock transcript about Mitochondria. Mitochondria are the powerhouse of the cell. They generate ATP."
+
+        meta = video["metadata"]
+        if video["transcript"] is None:
+            # Fallback: Return metadata if transcript fails
+            return f"Title: {meta['title']}\nDescription: {meta['description']}\n\n(Transcript unavailable: {video['transcript_error']})"
+
+        return f"Title: {meta['title']}\nDescription: {meta['description']}\n\nTranscript:\n{video['transcript']}"
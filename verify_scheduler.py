@@ -0,0 +1,59 @@
+import os
+import sys
+import random
+from datetime import datetime, timedelta, timezone
+
+import django
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+django.setup()
+
+from services.scheduler import calculate_next_review, calculate_next_reviews, to_datetimes
+
+
+def random_state(rng):
+    """
+    Random but reachable-looking SM-2 state, including edge cases.
+    """
+    ease = rng.choice([1.3, 2.5, rng.uniform(1.3, 3.5), round(rng.uniform(1.3, 3.0), 1)])
+    interval = rng.choice([0, 1, 6, rng.randint(0, 400), rng.randint(0, 36500)])
+    repetitions = rng.choice([0, 1, 2, rng.randint(0, 50)])
+    return rng.randint(0, 5), ease, interval, repetitions
+
+
+def run_scheduler_verification(cases=200000, seed=None):
+    print("🧮 Verifying vectorized SM-2 against the scalar implementation...")
+    seed = seed if seed is not None else random.randrange(2 ** 32)
+    rng = random.Random(seed)
+    print(f"   Seed: {seed}, cases: {cases}")
+
+    epoch = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    states = [random_state(rng) for _ in range(cases)]
+    reviewed_at = [epoch + timedelta(seconds=rng.randint(0, 10 ** 8), microseconds=rng.randint(0, 999999)) for _ in range(cases)]
+    ratings, eases, intervals, repetitions = zip(*states)
+
+    new_eases, new_intervals, new_reps, next_dates = calculate_next_reviews(
+        ratings, eases, intervals, repetitions, reviewed_at=reviewed_at
+    )
+    next_dates = to_datetimes(next_dates)
+
+    mismatches = 0
+    for i, (rating, ease, interval, reps) in enumerate(states):
+        expected = calculate_next_review(rating, ease, interval, reps, reviewed_at=reviewed_at[i])
+        actual = (float(new_eases[i]), int(new_intervals[i]), int(new_reps[i]), next_dates[i])
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"   ❌ Input {states[i]} @ {reviewed_at[i]}: scalar {expected} != vectorized {actual}")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} mismatches out of {cases}")
+        sys.exit(1)
+    print("\n🎉 Vectorized scheduler matches exactly!")
+
+
+if __name__ == "__main__":
+    run_scheduler_verification(seed=int(sys.argv[1]) if len(sys.argv) > 1 else None)